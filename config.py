@@ -527,11 +527,11 @@ class SiliconFlowTTSConfig(PluginConfigBase):
         },
     )
     response_format: str = Field(
-        default="wav",
+        default="mp3",
         description="音频返回格式（mp3/opus/wav/pcm）。",
         json_schema_extra={
             "label": "返回格式", "order": 6,
-            "hint": "推荐默认用 wav；只有确实需要时再手动改成 pcm/mp3/opus。",
+            "hint": "推荐默认用 mp3（传输体积比 wav/pcm 小一个数量级）；需要无损时再改 wav。",
             "depends_on": "voice.tts_provider", "depends_value": "siliconflow",
         },
     )
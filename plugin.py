@@ -1,5 +1,6 @@
 import asyncio
 import json
+import re
 from pathlib import Path
 import time
 import tomllib
@@ -23,9 +24,21 @@ from .src.recv_handler.discord_client import DiscordClientManager
 from .src.recv_handler.message_handler import DiscordMessageHandler
 from .src.send_handler.message_send_handler import DiscordContentBuilder
 from .src.send_handler.thread_send_handler import ThreadRoutingManager
+from .src.utils import debug_enabled
 from .src.voice.tts.gptsovits_tts import GPTSoVITSTTSProvider
 from .src.voice.voice_manager import VoiceManager
 
+# Discord 单条消息正文上限；拆分长消息时预留 10 字符给补全的代码块围栏等。
+MAX_MESSAGE_LENGTH = 2000
+MAX_SPLIT_LEN = MAX_MESSAGE_LENGTH - 10
+
+# Reaction 命令可接受的 emoji：Discord 自定义表情语法（含 add_reaction 对 str
+# 入参同样接受的裸形式 "name:id"/":name:id"/"a:name:id"）、键帽序列（"1️⃣"/"#️⃣" 等
+# 以 ASCII 打头，后跟 U+FE0F/U+20E3），或任意非 ASCII（Unicode 表情）。
+_REACTION_EMOJI_RE = re.compile(
+    r"^(?:<a?:\w{2,32}:\d{15,22}>|a?:?\w{2,32}:\d{15,22}|[0-9#*]\uFE0F?\u20E3|[\U00000080-\U0010FFFF]+)$"
+)
+
 
 class DiscordAdapterPlugin(MaiBotPlugin):
     """Discord 消息网关插件。
@@ -55,6 +68,11 @@ class DiscordAdapterPlugin(MaiBotPlugin):
             str,
             tuple[float, Optional[Dict[str, Dict[str, List[str]]]], str],
         ] = {}
+        # 出站消息段类型到处理器的分发表；未命中时走普通消息发送。
+        self._segment_dispatch = {
+            "command": self._handle_outbound_command,
+            "notify": self._handle_outbound_notify,
+        }
 
     async def on_load(self) -> None:
         """插件加载时根据当前配置启动或保持 Discord 连接。"""
@@ -556,14 +574,13 @@ class DiscordAdapterPlugin(MaiBotPlugin):
 
         segment_type = getattr(segment, "type", None)
 
-        if segment_type == "command":
-            return await self._handle_outbound_command(maim_message)
-
-        if segment_type == "notify":
-            self.ctx.logger.debug(f"收到 notify 消息，已忽略：{segment.data}")
-            return {"success": True}
+        handler = self._segment_dispatch.get(segment_type, self._handle_outbound_message)
+        return await handler(maim_message)
 
-        return await self._handle_outbound_message(maim_message)
+    async def _handle_outbound_notify(self, message: MessageBase) -> Dict[str, Any]:
+        """忽略 ``notify`` 类型消息段，仅打调试日志。"""
+        self.ctx.logger.debug(f"收到 notify 消息，已忽略：{message.message_segment.data}")
+        return {"success": True}
 
     def _deserialize_outbound_message(self, message: Dict[str, Any]) -> MessageBase:
         """兼容解析 Host MessageDict 与旧版 maim_message 字典。"""
@@ -787,12 +804,14 @@ class DiscordAdapterPlugin(MaiBotPlugin):
                 self._client_manager.stop_typing_indicator(source_channel_id)
             if isinstance(target_channel_id, int) and target_channel_id != source_channel_id:
                 self._client_manager.stop_typing_indicator(target_channel_id)
-        self.ctx.logger.debug(
-            "Discord outbound target resolved "
-            f"[channel_id={target_channel_id}, channel={target_channel_name}, "
-            f"type={target_channel_type}, voice_output_requested={voice_output_requested}, "
-            f"voice_manager={'yes' if self._voice_manager else 'no'}]"
-        )
+        # 每条出站消息都会经过这里；仅在 DEBUG 生效时才拼接诊断字符串。
+        if debug_enabled(self.ctx.logger):
+            self.ctx.logger.debug(
+                "Discord outbound target resolved "
+                f"[channel_id={target_channel_id}, channel={target_channel_name}, "
+                f"type={target_channel_type}, voice_output_requested={voice_output_requested}, "
+                f"voice_manager={'yes' if self._voice_manager else 'no'}]"
+            )
 
         if isinstance(target_channel, (discord.VoiceChannel, discord.StageChannel)):
             if self._voice_manager is not None:
@@ -829,7 +848,7 @@ class DiscordAdapterPlugin(MaiBotPlugin):
                     f"falling back to text chat delivery [channel_id={target_channel.id}]"
                 )
 
-        content, files = self._content_builder.build(message.message_segment)
+        content, files = await self._content_builder.build(message.message_segment)
         reference = await self._thread_routing.get_reply_reference(message, target_channel)
 
         if not content and not files:
@@ -857,7 +876,7 @@ class DiscordAdapterPlugin(MaiBotPlugin):
             self.ctx.logger.error("Discord voice outbound aborted: voice components are not initialized")
             return {"success": False, "error": "语音组件未初始化", "text_sent": False}
 
-        content, _ = self._content_builder.build(message.message_segment)
+        content, _ = await self._content_builder.build(message.message_segment)
         if not content or not content.strip():
             self.ctx.logger.error("Discord voice outbound aborted: message content is empty after rendering")
             return {"success": False, "error": "语音出站消息无文本内容", "text_sent": False}
@@ -881,10 +900,11 @@ class DiscordAdapterPlugin(MaiBotPlugin):
                         resolved_channel_id
                     )
             if target_text_channel and hasattr(target_text_channel, "send"):
-                self.ctx.logger.debug(
-                    "Discord voice outbound will also send text to the voice-channel chat "
-                    f"[channel_id={getattr(target_text_channel, 'id', None)}]"
-                )
+                if debug_enabled(self.ctx.logger):
+                    self.ctx.logger.debug(
+                        "Discord voice outbound will also send text to the voice-channel chat "
+                        f"[channel_id={getattr(target_text_channel, 'id', None)}]"
+                    )
                 try:
                     await target_text_channel.send(content=content)
                     text_sent = True
@@ -895,10 +915,11 @@ class DiscordAdapterPlugin(MaiBotPlugin):
                     "Discord voice outbound requested text echo, but no writable voice text channel was resolved"
                 )
 
-        self.ctx.logger.debug(
-            "Discord voice outbound invoking voice manager speak "
-            f"[channel_id={target_channel_id}, chars={len(content)}]"
-        )
+        if debug_enabled(self.ctx.logger):
+            self.ctx.logger.debug(
+                "Discord voice outbound invoking voice manager speak "
+                f"[channel_id={target_channel_id}, chars={len(content)}]"
+            )
         success = await self._voice_manager.speak(content, channel_id=channel_id)
         if success:
             self.ctx.logger.info(
@@ -971,15 +992,29 @@ class DiscordAdapterPlugin(MaiBotPlugin):
         if not target_message_id or not channel_id or not emoji_str:
             return {"success": False, "error": "缺少必要参数 (message_id, channel_id, emoji)"}
 
+        # 本地先校验 emoji 语法，避免把明显非法的输入发给 Discord 再等一轮 RTT 报错。
+        if not _REACTION_EMOJI_RE.match(str(emoji_str)):
+            return {"success": False, "error": f"emoji 格式无效: {emoji_str}"}
+
         client = self._client_manager.client
         try:
-            self._client_manager.stop_typing_indicator(int(channel_id))
-        except (TypeError, ValueError):
-            pass
+            channel_id_int = int(channel_id)
+        except (TypeError, ValueError) as exc:
+            return {"success": False, "error": f"参数格式错误: {exc}"}
+
+        self._client_manager.stop_typing_indicator(channel_id_int)
         try:
-            channel = client.get_channel(int(channel_id))
-            if not channel:
-                channel = await client.fetch_channel(int(channel_id))
+            # 同一频道上的连续 reaction 很常见；复用 ThreadRoutingManager 的
+            # 频道解析缓存（LRU + TTL + 负缓存），避免客户端缓存未命中时
+            # 反复走 fetch_channel 的 HTTP 往返。
+            if self._thread_routing is not None:
+                channel = await self._thread_routing.resolve_channel(channel_id_int)
+            else:
+                channel = client.get_channel(channel_id_int)
+                if not channel:
+                    channel = await client.fetch_channel(channel_id_int)
+            if channel is None:
+                return {"success": False, "error": f"频道不存在或不可访问: {channel_id_int}"}
 
             target_msg = await channel.fetch_message(int(target_message_id))
 
@@ -992,14 +1027,14 @@ class DiscordAdapterPlugin(MaiBotPlugin):
 
             return {"success": True}
 
-        except (discord.NotFound, discord.Forbidden, discord.HTTPException) as exc:
+        except discord.NotFound as exc:
+            return {"success": False, "error": str(exc)}
+        except (discord.Forbidden, discord.HTTPException) as exc:
             return {"success": False, "error": str(exc)}
         except (ValueError, TypeError) as exc:
             return {"success": False, "error": f"参数格式错误: {exc}"}
 
 
-    MAX_MESSAGE_LENGTH: int = 2000
-
     async def _send_with_length_check(
         self,
         channel: discord.abc.Messageable,
@@ -1018,15 +1053,17 @@ class DiscordAdapterPlugin(MaiBotPlugin):
         MAX_FILES = 10
         first_sent_message: Optional[discord.Message] = None
         if files:
-            file_list = list(files)
-            if len(file_list) > MAX_FILES:
+            # 上游传入的本来就是 list，仅在截断时才需要产生新列表。
+            file_list = files if isinstance(files, list) else list(files)
+            file_count = len(file_list)
+            if file_count > MAX_FILES:
                 self.ctx.logger.warning(
-                    f"消息包含 {len(file_list)} 个文件，超过限制，仅发送前 {MAX_FILES} 个"
+                    f"消息包含 {file_count} 个文件，超过限制，仅发送前 {MAX_FILES} 个"
                 )
                 file_list = file_list[:MAX_FILES]
 
             send_content: Optional[str] = None
-            if content and len(content) <= self.MAX_MESSAGE_LENGTH:
+            if content and len(content) <= MAX_MESSAGE_LENGTH:
                 send_content = content
                 content = None
 
@@ -1035,7 +1072,7 @@ class DiscordAdapterPlugin(MaiBotPlugin):
             )
 
         if content:
-            if len(content) <= self.MAX_MESSAGE_LENGTH:
+            if len(content) <= MAX_MESSAGE_LENGTH:
                 sent_message = await channel.send(
                     content=content, reference=reference if not files else None
                 )
@@ -1063,8 +1100,10 @@ class DiscordAdapterPlugin(MaiBotPlugin):
             content: 完整长文本。
             reference: 仅第一条片段使用的回复引用。
         """
-        max_len = self.MAX_MESSAGE_LENGTH - 10
-        if "```" in content:
+        max_len = MAX_SPLIT_LEN
+        # 只有出现成对的 ``` 才值得走保持代码块完整的拆分路径；
+        # 单个意外的 ``` 按普通文本处理，避免对长文本多做一次全量扫描。
+        if content.count("```") >= 2:
             parts = self._split_preserve_codeblocks(content, max_len)
         else:
             parts = self._split_by_lines(content, max_len)
@@ -4,13 +4,13 @@
 """
 
 import asyncio
-import traceback
 from time import time as get_time
 from typing import Any, Dict, Optional
 
 import discord
 
 from ..send_handler.thread_send_handler import ThreadRoutingManager
+from ..utils import log_debug_traceback
 from .message_handler import DiscordMessageHandler
 
 
@@ -265,6 +265,11 @@ class DiscordClientManager:
 
             routing_info = self._message_handler.get_thread_routing_info(message)
             if routing_info:
+                if routing_info["is_thread"]:
+                    # 入站时顺手记下消息所在子区，后续回复该消息时无需再探测子区。
+                    self._thread_routing_manager.note_thread_message(
+                        str(message.id), routing_info["thread_id"]
+                    )
                 if routing_info["is_inherit"]:
                     self._thread_routing_manager.update_thread_context(
                         routing_info["parent_channel_id"],
@@ -283,7 +288,7 @@ class DiscordClientManager:
             if typing_channel_id is not None:
                 self.stop_typing_indicator(typing_channel_id)
             self._logger.error(f"处理 Discord 消息时发生错误: {exc}")
-            self._logger.debug(traceback.format_exc())
+            log_debug_traceback(self._logger)
 
     def start_typing_indicator(self, channel: discord.abc.Messageable) -> Optional[int]:
         """在指定消息目标上启动短时 typing 指示。"""
@@ -473,7 +478,7 @@ class DiscordClientManager:
 
         except Exception as exc:
             self._logger.error(f"处理 {event_type} 事件时发生错误: {exc}")
-            self._logger.debug(traceback.format_exc())
+            log_debug_traceback(self._logger)
 
 
     async def start(self) -> None:
@@ -6,12 +6,12 @@
 import base64
 import re
 import time
-import traceback
 from typing import Any, Dict, List, Optional
 
 import discord
 from maim_message import BaseMessageInfo, FormatInfo, GroupInfo, MessageBase, Seg, UserInfo
 
+from ..utils import log_debug_traceback
 from .emoji_mapping import format_reaction_for_ai, get_emoji_meaning
 
 
@@ -60,7 +60,7 @@ class DiscordMessageHandler:
             return self.build_host_message_dict(maim_message)
         except Exception as exc:
             self._logger.error(f"处理 Discord 消息时发生错误: {exc}")
-            self._logger.debug(traceback.format_exc())
+            log_debug_traceback(self._logger)
             return None
 
     async def handle_reaction_event(
@@ -86,7 +86,7 @@ class DiscordMessageHandler:
             return self.build_host_message_dict(maim_message)
         except Exception as exc:
             self._logger.error(f"转换 {event_type} 事件时发生错误: {exc}")
-            self._logger.debug(traceback.format_exc())
+            log_debug_traceback(self._logger)
             return None
 
     def build_host_message_dict(self, maim_message: MessageBase) -> Dict[str, Any]:
@@ -798,7 +798,7 @@ class DiscordMessageHandler:
 
         except Exception as exc:
             self._logger.error(f"转换 reaction 事件时发生错误: {exc}")
-            self._logger.debug(traceback.format_exc())
+            log_debug_traceback(self._logger)
             return None
 
     async def _resolve_reaction_user(
@@ -1,11 +1,14 @@
 """将 MaiBot Seg 结构转换为 Discord 可接受的文本与附件。"""
 
+import asyncio
 import base64
 import binascii
 import io
+import itertools
 import json
 import logging
 import time
+from collections import deque
 from typing import Any, Dict, List, Optional, Tuple
 
 import discord
@@ -13,8 +16,29 @@ from maim_message import Seg
 
 _logger = logging.getLogger("discord_adapter.content_builder")
 
+try:
+    # 可选的快速魔数识别后端：filetype 在库内完成匹配，比逐条 startswith 更快。
+    import filetype as _filetype
+except ImportError:
+    _filetype = None
+
+try:
+    # 可选的 SIMD base64 解码后端；大图/语音附件解码是内存带宽密集型操作。
+    import pybase64
+
+    _b64decode = pybase64.b64decode
+except ImportError:
+    _b64decode = base64.b64decode
+
 SegmentDict = Dict[str, Any]
 
+# 常见图片魔数（前 8 字节按大端解释为整数后比较，避免多次 startswith）。
+_MAGIC_PNG = 0x89504E470D0A1A0A
+_MAGIC_JPG = 0xFFD8FF  # 前 3 字节
+_MAGIC_GIF = (0x474946383761, 0x474946383961)  # GIF87a / GIF89a，前 6 字节
+_MAGIC_RIFF = 0x52494646  # 前 4 字节，WEBP 还需校验第 8-12 字节
+_MAGIC_BMP = 0x424D  # 前 2 字节
+
 
 class DiscordContentBuilder:
     """将 MaiBot 的 Seg 片段树递归解析为 Discord 可用的正文与附件列表。
@@ -32,8 +56,11 @@ class DiscordContentBuilder:
 
         self._logger = logger or _logger
 
-    def build(self, message_segment: Seg) -> Tuple[Optional[str], List[discord.File]]:
-        """从根 Seg 递归构建 Discord 消息正文与附件列表。
+    async def build(self, message_segment: Seg) -> Tuple[Optional[str], List[discord.File]]:
+        """从根 Seg 构建 Discord 消息正文与附件列表。
+
+        遍历只收集文本与待解码的 base64 载荷；全部附件在遍历结束后通过
+        一次 executor 调度批量解码，避免大附件的解码阻塞事件循环。
 
         Args:
             message_segment: MaiBot 消息根片段（可含 seglist 嵌套）。
@@ -42,74 +69,124 @@ class DiscordContentBuilder:
             二元组：(正文字符串，若无有效文本则为 None)、`discord.File` 附件列表。
         """
         content_parts: List[str] = []
-        files: List[discord.File] = []
-
-        def process(seg: Seg) -> None:
-            if not getattr(seg, "type", None):
-                return
-
-            if seg.type == "thread_context":
-                return
-
-            if seg.type == "seglist" and isinstance(seg.data, list):
-                for sub in seg.data:
-                    if isinstance(sub, Seg):
-                        process(sub)
-                return
-
-            if seg.type == "text":
-                if seg.data is not None:
-                    content_parts.append(str(seg.data))
-                return
-
-            if seg.type == "mention":
-                mention_text = self._render_mention(seg.data)
+        # (content_parts 占位下标, 片段类型, 原始载荷)；解码失败时回填占位说明。
+        pending_attachments: List[Tuple[int, str, Any]] = []
+        # 时间戳在一次 build 内取一次即可。
+        timestamp = int(time.time())
+        # 同一条消息里相同的提及载荷只渲染一次（长回复中常见重复片段）。
+        mention_cache: Dict[Any, str] = {}
+
+        # 显式栈遍历片段树：深层嵌套 seglist 不再逐层递归调用。
+        pending = deque([message_segment])
+        while pending:
+            seg = pending.popleft()
+            # 属性各读一次绑定到局部；Seg 恒有 type/data，try 在无异常时零开销。
+            try:
+                seg_type = seg.type
+                payload = seg.data
+            except AttributeError:
+                continue
+            if not seg_type:
+                continue
+
+            if seg_type in {"thread_context", "reply"}:
+                continue
+
+            if seg_type == "seglist" and isinstance(payload, list):
+                # 子片段按原顺序插回队头，保持与递归一致的遍历次序。
+                pending.extendleft(
+                    sub for sub in reversed(payload) if isinstance(sub, Seg)
+                )
+                continue
+
+            if seg_type == "text":
+                if payload is not None:
+                    text = str(payload)
+                    if text:
+                        content_parts.append(text)
+                continue
+
+            if seg_type == "mention":
+                # 字符串按值命中；dict 不可哈希，按对象身份命中（同一对象复用时有效）。
+                cache_key = payload if isinstance(payload, str) else id(payload)
+                mention_text = mention_cache.get(cache_key)
+                if mention_text is None:
+                    mention_text = self._render_mention(payload)
+                    mention_cache[cache_key] = mention_text
                 if mention_text:
                     content_parts.append(mention_text)
-                return
+                continue
 
-            if seg.type in {"emoji", "image"}:
-                file_item: Optional[discord.File] = None
-                if isinstance(seg.data, str):
-                    file_item = self._decode_image_to_attachment(seg.type, seg.data)
-                if file_item:
-                    files.append(file_item)
-                else:
-                    display = "表情" if seg.type == "emoji" else "图片"
-                    content_parts.append(f"[{display}处理失败]")
-                return
-
-            if seg.type == "voice":
-                voice_file = self._decode_voice(seg.data)
-                if voice_file:
-                    files.append(voice_file)
-                else:
-                    content_parts.append("[语音处理失败]")
-                return
-
-            if seg.type == "video":
-                content_parts.append(f"[视频: {seg.data}]")
-                return
+            if seg_type in {"emoji", "image", "voice"}:
+                content_parts.append("")  # 先占位，批量解码失败时回填说明文本
+                pending_attachments.append((len(content_parts) - 1, seg_type, payload))
+                continue
 
-            if seg.type == "file":
-                content_parts.append(f"[文件: {seg.data}]")
-                return
+            if seg_type == "video":
+                content_parts.append(f"[视频: {payload}]")
+                continue
 
-            if seg.type == "command":
-                content_parts.append(f"[命令: {seg.data}]")
-                return
+            if seg_type == "file":
+                content_parts.append(f"[文件: {payload}]")
+                continue
 
-            if seg.type == "notify":
-                content_parts.append(f"[通知: {seg.data}]")
-                return
+            if seg_type == "command":
+                content_parts.append(f"[命令: {payload}]")
+                continue
 
-            if seg.type == "reply":
-                return
+            if seg_type == "notify":
+                content_parts.append(f"[通知: {payload}]")
+                continue
 
-        process(message_segment)
-        content_text = "\n".join(part for part in content_parts if part)
+        files: List[discord.File] = []
+        if pending_attachments:
+            loop = asyncio.get_running_loop()
+            files, failures = await loop.run_in_executor(
+                None, self._decode_attachments_batch, pending_attachments, timestamp
+            )
+            for part_index, failure_text in failures:
+                content_parts[part_index] = failure_text
+            # 解码成功的占位仍是空串，此时需要过滤一遍；纯文本消息走上面的快路径。
+            content_parts = [part for part in content_parts if part]
+
+        content_text = "\n".join(content_parts)
         return (content_text if content_text else None, files)
 
+    def _decode_attachments_batch(
+        self, pending: List[Tuple[int, str, Any]], timestamp: int
+    ) -> Tuple[List[discord.File], List[Tuple[int, str]]]:
+        """在一次 executor 调度内按序解码全部附件载荷。
+
+        Args:
+            pending: (占位下标, 片段类型, 原始载荷) 列表，按遍历顺序排列。
+            timestamp: 本次 build 的统一时间戳。
+
+        Returns:
+            二元组：成功的 `discord.File` 列表、(占位下标, 失败说明) 列表。
+        """
+        files: List[discord.File] = []
+        failures: List[Tuple[int, str]] = []
+        attachment_index = itertools.count()
+        for part_index, seg_type, data in pending:
+            if seg_type == "voice":
+                file_item = self._decode_voice(data, timestamp, next(attachment_index))
+                if file_item:
+                    files.append(file_item)
+                else:
+                    failures.append((part_index, "[语音处理失败]"))
+                continue
+            file_item = None
+            if isinstance(data, str):
+                file_item = self._decode_image_to_attachment(
+                    seg_type, data, timestamp, next(attachment_index)
+                )
+            if file_item:
+                files.append(file_item)
+            else:
+                display = "表情" if seg_type == "emoji" else "图片"
+                failures.append((part_index, f"[{display}处理失败]"))
+        return files, failures
+
     def _render_mention(self, mention_data: Any) -> str:
         """将提及载荷规范化为 Discord 可发送的 @ 文本。
 
@@ -140,12 +217,16 @@ class DiscordContentBuilder:
 
         return " ".join(parts)
 
-    def _decode_image_to_attachment(self, seg_type: str, data: str) -> Optional[discord.File]:
+    def _decode_image_to_attachment(
+        self, seg_type: str, data: str, timestamp: int, index: int
+    ) -> Optional[discord.File]:
         """将 base64 图片或表情数据解码为带合适扩展名的 Discord 附件。
 
         Args:
             seg_type: 片段类型，应为 ``emoji`` 或 ``image``（影响文件名前缀）。
             data: base64 编码的字节串。
+            timestamp: 本次 build 的统一时间戳，用于文件名。
+            index: 附件在本条消息内的序号，避免同秒多附件重名。
 
         Returns:
             成功时返回 `discord.File`；数据为空或解码失败时返回 None。
@@ -153,20 +234,23 @@ class DiscordContentBuilder:
         if not data:
             return None
         try:
-            decoded = base64.b64decode(str(data))
+            # 调用方已保证 data 为 str；显式 encode 让解码全程走 bytes 快路径。
+            decoded = _b64decode(data.encode("ascii"))
         except (ValueError, TypeError, binascii.Error) as exc:
             self._logger.warning(f"解码 {seg_type} base64 数据失败：{exc}")
             return None
         suffix = self._detect_image_suffix(decoded)
         prefix = "emoji" if seg_type == "emoji" else "image"
-        filename = f"{prefix}_{int(time.time())}.{suffix}"
+        filename = f"{prefix}_{timestamp}_{index}.{suffix}"
         return discord.File(fp=io.BytesIO(decoded), filename=filename)
 
-    def _decode_voice(self, data: Any) -> Optional[discord.File]:
+    def _decode_voice(self, data: Any, timestamp: int, index: int) -> Optional[discord.File]:
         """将 base64 语音数据解码为 WAV 附件。
 
         Args:
             data: base64 编码的字符串；非字符串或空串不予处理。
+            timestamp: 本次 build 的统一时间戳，用于文件名。
+            index: 附件在本条消息内的序号，避免同秒多附件重名。
 
         Returns:
             成功时返回 `discord.File`；否则返回 None。
@@ -174,11 +258,11 @@ class DiscordContentBuilder:
         if not isinstance(data, str) or not data:
             return None
         try:
-            decoded = base64.b64decode(str(data))
+            decoded = _b64decode(data.encode("ascii"))
         except (ValueError, TypeError, binascii.Error) as exc:
             self._logger.warning(f"解码语音失败：{exc}")
             return None
-        filename = f"voice_{int(time.time())}.wav"
+        filename = f"voice_{timestamp}_{index}.wav"
         return discord.File(fp=io.BytesIO(decoded), filename=filename)
 
     @staticmethod
@@ -191,15 +275,24 @@ class DiscordContentBuilder:
         Returns:
             小写扩展名；未识别时为 ``bin``。
         """
-        if image_bytes.startswith(b"\x89PNG\r\n\x1a\n"):
+        if _filetype is not None:
+            # filetype 最多只需要前 261 字节；其返回的 jpeg 统一映射为 jpg 以保持原有约定。
+            ext = _filetype.guess_extension(image_bytes[:261])
+            if ext:
+                return "jpg" if ext == "jpeg" else ext
+        if len(image_bytes) < 8:
+            return "bin"
+        # 一次读入前 8 字节，整数比较代替逐条 startswith。
+        head = int.from_bytes(image_bytes[:8], "big")
+        if head == _MAGIC_PNG:
             return "png"
-        if image_bytes.startswith(b"\xff\xd8\xff"):
+        if head >> 40 == _MAGIC_JPG:
             return "jpg"
-        if image_bytes.startswith(b"GIF87a") or image_bytes.startswith(b"GIF89a"):
+        if head >> 16 in _MAGIC_GIF:
             return "gif"
-        if len(image_bytes) >= 12 and image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        if head >> 32 == _MAGIC_RIFF and image_bytes[8:12] == b"WEBP":
             return "webp"
-        if image_bytes.startswith(b"BM"):
+        if head >> 48 == _MAGIC_BMP:
             return "bmp"
         return "bin"
 
@@ -216,8 +309,12 @@ class DiscordContentBuilder:
         if isinstance(payload, dict):
             return payload
         if isinstance(payload, str):
+            # 顶层必须是对象才有意义；非 { 开头的字符串直接跳过 JSON 解析。
+            stripped = payload.lstrip()
+            if not stripped or stripped[0] != "{":
+                return None
             try:
-                loaded = json.loads(payload)
+                loaded = json.loads(stripped)
             except json.JSONDecodeError:
                 return None
             return loaded if isinstance(loaded, dict) else None
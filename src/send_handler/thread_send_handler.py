@@ -1,11 +1,28 @@
 """Discord 子区路由管理器。"""
 
+import asyncio
 import json
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
 
 import discord
 from maim_message import BaseMessageInfo, MessageBase, Seg
 
+# 「消息 ID → 所在子区 ID」缓存上限；超出后按 LRU 淘汰最久未用的条目。
+MESSAGE_THREAD_CACHE_SIZE = 10000
+
+# 频道/用户缓存的容量与存活时间；负缓存（确认不存在）用更短的 TTL，
+# 以免持续发往已删除频道的消息反复触发 REST 404。
+CHANNEL_CACHE_SIZE = 2048
+CHANNEL_CACHE_TTL = 600.0
+USER_CACHE_SIZE = 2048
+USER_CACHE_TTL = 600.0
+NEGATIVE_CACHE_TTL = 30.0
+
+# reply 载荷中可直接 str() 的标量类型（精确匹配，避免逐个 isinstance）。
+_REPLY_SCALAR_TYPES = frozenset({int, float, str})
+
 
 class ThreadRoutingManager:
     """维护 Discord 子区与父频道映射，并据消息元数据解析可发送频道或私聊目标。
@@ -24,8 +41,10 @@ class ThreadRoutingManager:
         self._logger = logger
         self._chat_config = chat_config
         self._thread_context_map: Dict[str, str] = {}
-        self._channel_cache: Dict[int, discord.abc.Messageable] = {}
-        self._user_cache: Dict[int, discord.User] = {}
+        self._message_thread_map: "OrderedDict[int, int]" = OrderedDict()
+        # 值为 (对象, 过期时刻)；对象为 None 表示负缓存（确认不存在）。
+        self._channel_cache: "OrderedDict[int, Tuple[Optional[discord.abc.Messageable], float]]" = OrderedDict()
+        self._user_cache: "OrderedDict[int, Tuple[Optional[discord.User], float]]" = OrderedDict()
         self._client: Optional[discord.Client] = None
 
     def bind_client(self, client: discord.Client) -> None:
@@ -66,6 +85,23 @@ class ThreadRoutingManager:
         if previous:
             self._logger.debug(f"清除子区上下文映射：{parent_channel_id} (之前映射到 {previous})")
 
+    def note_thread_message(self, message_id: str, thread_id: str) -> None:
+        """记录「消息 ID → 所在子区 ID」，供回复路由免去遍历子区的探测。
+
+        Args:
+            message_id: 子区内消息的字符串形式 ID。
+            thread_id: 消息所在子区的字符串形式 ID。
+        """
+        try:
+            message_int = int(message_id)
+            thread_int = int(thread_id)
+        except (TypeError, ValueError):
+            return
+        self._message_thread_map[message_int] = thread_int
+        self._message_thread_map.move_to_end(message_int)
+        while len(self._message_thread_map) > MESSAGE_THREAD_CACHE_SIZE:
+            self._message_thread_map.popitem(last=False)
+
     def get_active_thread(self, parent_channel_id: str) -> Optional[str]:
         """查询父频道当前映射到的子区 ID。
 
@@ -172,18 +208,12 @@ class ThreadRoutingManager:
         except (TypeError, ValueError):
             self._logger.warning(f"Invalid guild target channel id: {raw_target_id}")
             return None
-        thread_routing = self._extract_thread_routing_info(message.message_segment)
-        reply_id = self._extract_reply_message_id(message.message_segment)
+        reply_id, thread_routing = self._extract_routing_and_reply(message.message_segment)
         reply_in_parent = False
         inherit = getattr(self._chat_config, "inherit_channel_memory", True)
 
         if thread_routing:
-            thread_channel = self._get_cached_channel(int(thread_routing["original_thread_id"]))
-            if not thread_channel:
-                fetched = self._client.get_channel(int(thread_routing["original_thread_id"]))
-                if fetched:
-                    thread_channel = fetched
-                    self._channel_cache[int(fetched.id)] = fetched
+            thread_channel = await self.resolve_channel(int(thread_routing["original_thread_id"]))
             if isinstance(thread_channel, discord.Thread):
                 return thread_channel
             self._logger.warning(f"子区路由目标无效，回退到父频道：{thread_routing}")
@@ -194,15 +224,7 @@ class ThreadRoutingManager:
                 return thread_from_reply
             reply_in_parent = await self._reply_in_parent_channel(reply_id, target_id)
 
-        channel = self._get_cached_channel(target_id)
-        if not channel:
-            fetched = self._client.get_channel(target_id)
-            if fetched:
-                channel = fetched
-                self._channel_cache[target_id] = fetched
-
-        if channel is None:
-            channel = await self._fetch_channel(target_id)
+        channel = await self.resolve_channel(target_id)
 
         if channel is None:
             self._logger.warning(f"找不到频道或子区：{target_id}")
@@ -222,9 +244,7 @@ class ThreadRoutingManager:
             if inherit and not reply_in_parent:
                 active_thread_id = self.get_active_thread(str(target_id))
                 if active_thread_id:
-                    mapped = self._get_cached_channel(int(active_thread_id))
-                    if not mapped:
-                        mapped = self._client.get_channel(int(active_thread_id))
+                    mapped = await self.resolve_channel(int(active_thread_id))
                     if isinstance(mapped, discord.Thread):
                         return mapped
             return channel
@@ -257,18 +277,21 @@ class ThreadRoutingManager:
             self._logger.error(f"用户 ID 无效：{user_id}")
             return None
 
-        user = self._user_cache.get(int_user_id) or self._client.get_user(int_user_id)
+        user = self._get_cached_user(int_user_id) or self._client.get_user(int_user_id)
         if not user:
+            if self._user_fetch_suppressed(int_user_id):
+                return None
             try:
                 user = await self._client.fetch_user(int_user_id)
             except discord.NotFound:
                 self._logger.warning(f"用户 {int_user_id} 不存在")
+                self._store_user(int_user_id, None)
                 return None
             except discord.HTTPException as exc:
                 self._logger.error(f"获取用户 {int_user_id} 失败：{exc}")
                 return None
 
-        self._user_cache[int_user_id] = user
+        self._store_user(int_user_id, user)
         if user.dm_channel:
             return user.dm_channel
         try:
@@ -298,10 +321,108 @@ class ThreadRoutingManager:
             channel_id: Discord 频道数字 ID。
 
         Returns:
-            缓存的 `Messageable`；未命中时返回 None。
+            缓存的 `Messageable`；未命中、已过期或为负缓存条目时返回 None。
+        """
+        cache = self._channel_cache
+        entry = cache.get(channel_id)
+        if entry is None:
+            return None
+        channel, expiry = entry
+        if time.monotonic() >= expiry:
+            cache.pop(channel_id, None)
+            return None
+        cache.move_to_end(channel_id)
+        return channel
+
+    def _store_channel(
+        self, channel_id: int, channel: Optional[discord.abc.Messageable]
+    ) -> None:
+        """写入频道缓存（含 LRU 淘汰）；传入 None 记录短 TTL 的负缓存。
+
+        Args:
+            channel_id: Discord 频道数字 ID。
+            channel: 频道对象；None 表示确认不存在。
         """
+        ttl = CHANNEL_CACHE_TTL if channel is not None else NEGATIVE_CACHE_TTL
+        cache = self._channel_cache
+        cache[channel_id] = (channel, time.monotonic() + ttl)
+        cache.move_to_end(channel_id)
+        while len(cache) > CHANNEL_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _channel_fetch_suppressed(self, channel_id: int) -> bool:
+        """判断频道是否命中未过期的负缓存（近期确认过不存在）。
+
+        Args:
+            channel_id: Discord 频道数字 ID。
+
+        Returns:
+            命中负缓存时为 True，此时应跳过 REST 拉取。
+        """
+        entry = self._channel_cache.get(channel_id)
+        return entry is not None and entry[0] is None and time.monotonic() < entry[1]
+
+    def _get_cached_user(self, user_id: int) -> Optional[discord.User]:
+        """从用户缓存读取对象；未命中、已过期或为负缓存条目时返回 None。
+
+        Args:
+            user_id: Discord 用户数字 ID。
+        """
+        cache = self._user_cache
+        entry = cache.get(user_id)
+        if entry is None:
+            return None
+        user, expiry = entry
+        if time.monotonic() >= expiry:
+            cache.pop(user_id, None)
+            return None
+        cache.move_to_end(user_id)
+        return user
+
+    def _store_user(self, user_id: int, user: Optional[discord.User]) -> None:
+        """写入用户缓存（含 LRU 淘汰）；传入 None 记录短 TTL 的负缓存。
+
+        Args:
+            user_id: Discord 用户数字 ID。
+            user: 用户对象；None 表示确认不存在。
+        """
+        ttl = USER_CACHE_TTL if user is not None else NEGATIVE_CACHE_TTL
+        cache = self._user_cache
+        cache[user_id] = (user, time.monotonic() + ttl)
+        cache.move_to_end(user_id)
+        while len(cache) > USER_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _user_fetch_suppressed(self, user_id: int) -> bool:
+        """判断用户是否命中未过期的负缓存（近期确认过不存在）。
+
+        Args:
+            user_id: Discord 用户数字 ID。
+        """
+        entry = self._user_cache.get(user_id)
+        return entry is not None and entry[0] is None and time.monotonic() < entry[1]
+
+    async def resolve_channel(self, channel_id: int) -> Optional[discord.abc.Messageable]:
+        """统一的频道解析入口：缓存 → `get_channel` → `fetch_channel`，单点写缓存。
+
+        带 LRU 上限、TTL 与负缓存，也供插件层（如 reaction 命令）复用。
+
+        Args:
+            channel_id: Discord 频道数字 ID。
 
-        return self._channel_cache.get(channel_id)
+        Returns:
+            频道对象；无客户端或三级解析均未命中时返回 None。
+        """
+        if self._client is None:
+            return None
+        channel = self._get_cached_channel(channel_id)
+        if channel is not None:
+            return channel
+        channel = self._client.get_channel(channel_id)
+        if channel is not None:
+            self._store_channel(channel_id, channel)
+            return channel
+        return await self._fetch_channel(channel_id)
 
     async def _fetch_channel(self, channel_id: int) -> Optional[discord.abc.Messageable]:
         """通过 API 拉取频道并写入缓存；用于 `get_channel` 未命中时。
@@ -314,9 +435,12 @@ class ThreadRoutingManager:
         """
         if self._client is None:
             return None
+        if self._channel_fetch_suppressed(channel_id):
+            return None
         try:
             channel = await self._client.fetch_channel(channel_id)
         except discord.NotFound:
+            self._store_channel(channel_id, None)
             return None
         except discord.Forbidden:
             self._logger.error(f"无权限访问频道 {channel_id}")
@@ -324,7 +448,7 @@ class ThreadRoutingManager:
         except discord.HTTPException as exc:
             self._logger.error(f"获取频道 {channel_id} 时出错：{exc}")
             return None
-        self._channel_cache[channel_id] = channel
+        self._store_channel(channel_id, channel)
         return channel
 
     async def _reply_in_parent_channel(self, reply_id: str, parent_channel_id: int) -> bool:
@@ -367,95 +491,170 @@ class ThreadRoutingManager:
         except (TypeError, ValueError):
             return None
 
-        parent = self._client.get_channel(parent_channel_id)
+        cached_thread_id = self._message_thread_map.get(message_int)
+        if cached_thread_id is not None:
+            self._message_thread_map.move_to_end(message_int)
+            cached_thread = self._get_cached_channel(cached_thread_id)
+            if cached_thread is None:
+                cached_thread = self._client.get_channel(cached_thread_id)
+                if cached_thread is not None:
+                    self._store_channel(cached_thread_id, cached_thread)
+            if isinstance(cached_thread, discord.Thread):
+                return cached_thread
+            # 子区可能已删除或不可见，丢弃失效条目并走常规探测。
+            self._message_thread_map.pop(message_int, None)
+
+        parent = self._get_cached_channel(parent_channel_id)
+        if parent is None:
+            parent = self._client.get_channel(parent_channel_id)
+            if parent is not None:
+                self._store_channel(parent_channel_id, parent)
         if not isinstance(parent, discord.TextChannel):
             return None
 
-        for thread in parent.threads:
-            try:
-                await thread.fetch_message(message_int)
-                return thread
-            except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-                continue
+        def may_contain(thread: discord.Thread) -> bool:
+            # 雪花 ID 随时间单调递增：目标消息比子区最后一条消息还新时必然不在其中，
+            # 直接跳过可省掉一次完整的消息拉取。
+            last_id = getattr(thread, "last_message_id", None)
+            return last_id is None or message_int <= last_id
+
+        active = [thread for thread in parent.threads if may_contain(thread)]
+        found = await self._probe_threads_concurrently(active, message_int)
+        if found is not None:
+            self.note_thread_message(message_id, str(found.id))
+            return found
 
         try:
             archived = [t async for t in parent.archived_threads(limit=50)]
         except discord.HTTPException:
             archived = []
 
-        for thread in archived:
-            try:
-                await thread.fetch_message(message_int)
-                return thread
-            except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-                continue
+        archived = [thread for thread in archived if may_contain(thread)]
+        found = await self._probe_threads_concurrently(archived, message_int)
+        if found is not None:
+            self.note_thread_message(message_id, str(found.id))
+        return found
 
-        return None
+    async def _probe_threads_concurrently(
+        self, threads: List[discord.Thread], message_int: int
+    ) -> Optional[discord.Thread]:
+        """有界并发地在一批子区里探测消息，首个命中即返回并取消其余探测。
 
-    def _extract_reply_message_id(self, segment: Seg) -> Optional[str]:
-        """自片段树深度优先提取首个 ``reply`` 片段中的被回复消息 ID。
+        串行逐个 fetch_message 会按子区数量放大 RTT；并发探测后总耗时
+        取决于最先命中的那次请求，落后的探测在命中后立即取消。
+
+        Args:
+            threads: 待探测的子区列表。
+            message_int: 目标消息的数字 ID。
+
+        Returns:
+            包含该消息的 `discord.Thread`；全部未命中时返回 None。
+        """
+        if not threads:
+            return None
+
+        semaphore = asyncio.Semaphore(8)
+
+        async def probe(thread: discord.Thread) -> Optional[discord.Thread]:
+            async with semaphore:
+                try:
+                    await thread.fetch_message(message_int)
+                    return thread
+                except (discord.NotFound, discord.Forbidden, discord.HTTPException):
+                    return None
+
+        tasks = [asyncio.create_task(probe(thread)) for thread in threads]
+        found: Optional[discord.Thread] = None
+        try:
+            for future in asyncio.as_completed(tasks):
+                result = await future
+                if result is not None:
+                    found = result
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return found
+
+    def _extract_routing_and_reply(
+        self, segment: Seg
+    ) -> "tuple[Optional[str], Optional[Dict[str, Any]]]":
+        """单次深度优先遍历片段树，同时提取回复消息 ID 与 ``thread_context`` 载荷。
+
+        两项信息在路由解析时总是同时需要，合并遍历避免对同一棵树走两遍；
+        两者都找到后立即提前返回。
 
         Args:
             segment: 根 Seg，可含嵌套 `seglist`。
 
         Returns:
-            消息 ID 字符串；无回复片段或无法解析时返回 None。
+            二元组 (回复消息 ID, 子区路由信息字典)；各自缺失时对应项为 None。
         """
+        reply_id: Optional[str] = None
+        thread_routing: Optional[Dict[str, Any]] = None
 
-        def extract(seg: Seg) -> Optional[str]:
-            if not getattr(seg, "type", None):
-                return None
-            if seg.type == "reply":
+        pending = deque([segment])
+        while pending:
+            seg = pending.popleft()
+            # 属性各读一次绑定到局部；Seg 恒有 type/data，try 在无异常时零开销。
+            try:
+                seg_type = seg.type
                 payload = seg.data
-                if isinstance(payload, str):
-                    normalized = self._normalize_dict(payload)
-                    if normalized and normalized.get("message_id") is not None:
-                        return str(normalized["message_id"])
-                    return payload
-                if isinstance(payload, dict):
-                    mid = payload.get("message_id")
-                    return str(mid) if mid is not None else None
-                if isinstance(payload, (int, float)):
-                    return str(payload)
-                if isinstance(payload, list):
-                    for candidate in payload:
-                        if isinstance(candidate, (str, int, float)):
-                            return str(candidate)
-                return None
-            if seg.type == "seglist" and isinstance(seg.data, list):
-                for sub in seg.data:
-                    if isinstance(sub, Seg):
-                        result = extract(sub)
-                        if result:
-                            return result
-            return None
-
-        return extract(segment)
+            except AttributeError:
+                continue
+            if not seg_type:
+                continue
+            if seg_type == "reply" and not reply_id:
+                reply_id = self._parse_reply_payload(payload)
+            elif seg_type == "thread_context" and not thread_routing:
+                thread_routing = self._normalize_dict(payload)
+            elif seg_type == "seglist" and isinstance(payload, list):
+                pending.extendleft(
+                    sub for sub in reversed(payload) if isinstance(sub, Seg)
+                )
+            if reply_id and thread_routing:
+                break
+
+        return reply_id, thread_routing
 
-    def _extract_thread_routing_info(self, segment: Seg) -> Optional[Dict[str, Any]]:
-        """自片段树中提取首个 ``thread_context`` 载荷（规范化后的字典）。
+    def _extract_reply_message_id(self, segment: Seg) -> Optional[str]:
+        """自片段树深度优先提取首个 ``reply`` 片段中的被回复消息 ID。
 
         Args:
             segment: 根 Seg，可含嵌套 `seglist`。
 
         Returns:
-            子区路由信息字典；无 `thread_context` 时返回 None。
+            消息 ID 字符串；无回复片段或无法解析时返回 None。
         """
+        reply_id, _ = self._extract_routing_and_reply(segment)
+        return reply_id
 
-        def extract(seg: Seg) -> Optional[Dict[str, Any]]:
-            if not getattr(seg, "type", None):
-                return None
-            if seg.type == "thread_context":
-                return self._normalize_dict(seg.data)
-            if seg.type == "seglist" and isinstance(seg.data, list):
-                for sub in seg.data:
-                    if isinstance(sub, Seg):
-                        result = extract(sub)
-                        if result:
-                            return result
-            return None
+    def _parse_reply_payload(self, payload: Any) -> Optional[str]:
+        """将单个 ``reply`` 片段的载荷解析为消息 ID 字符串。
 
-        return extract(segment)
+        Args:
+            payload: ``reply`` 片段的 data（字符串、字典、数字或列表）。
+
+        Returns:
+            消息 ID 字符串；无法解析时返回 None。
+        """
+        payload_type = type(payload)
+        if payload_type is str:
+            normalized = self._normalize_dict(payload)
+            if normalized and normalized.get("message_id") is not None:
+                return str(normalized["message_id"])
+            return payload
+        if payload_type is dict:
+            mid = payload.get("message_id")
+            return str(mid) if mid is not None else None
+        if payload_type in _REPLY_SCALAR_TYPES:
+            return str(payload)
+        if payload_type is list:
+            for candidate in payload:
+                if type(candidate) in _REPLY_SCALAR_TYPES:
+                    return str(candidate)
+        return None
 
     @staticmethod
     def _normalize_dict(data: Any) -> Optional[Dict[str, Any]]:
@@ -470,8 +669,12 @@ class ThreadRoutingManager:
         if isinstance(data, dict):
             return data
         if isinstance(data, str):
+            # 顶层必须是对象才有意义；纯消息 ID 之类的字符串直接跳过 JSON 解析。
+            stripped = data.lstrip()
+            if not stripped or stripped[0] != "{":
+                return None
             try:
-                loaded = json.loads(data)
+                loaded = json.loads(stripped)
             except json.JSONDecodeError:
                 return None
             return loaded if isinstance(loaded, dict) else None
@@ -3,8 +3,11 @@
 """
 
 import asyncio
+import logging
 import time
-from typing import Any, List
+import traceback
+from collections import deque
+from typing import Any, Deque, Set
 from pathlib import Path
 
 
@@ -63,6 +66,30 @@ def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
     return text[:max_length - len(suffix)] + suffix
 
 
+def debug_enabled(logger: Any) -> bool:
+    """判断 DEBUG 日志是否会被实际输出，供热路径跳过昂贵的日志拼装。
+
+    对没有 ``isEnabledFor`` 的鸭子类型日志器宽松放行（视为生效）。
+
+    Args:
+        logger: 标准库或兼容接口的日志器。
+
+    Returns:
+        bool: DEBUG 级别记录是否会被输出。
+    """
+    return getattr(logger, "isEnabledFor", lambda _level: True)(logging.DEBUG)
+
+
+def log_debug_traceback(logger: Any) -> None:
+    """仅在 DEBUG 生效时输出当前异常堆栈，避免每次失败都白白遍历调用帧。
+
+    Args:
+        logger: 日志器。
+    """
+    if debug_enabled(logger):
+        logger.debug(traceback.format_exc())
+
+
 async def safe_await(coro, timeout: float = 30.0, default: Any = None) -> Any:
     """安全地等待协程执行，带超时保护
     
@@ -83,7 +110,13 @@ async def safe_await(coro, timeout: float = 30.0, default: Any = None) -> Any:
 
 
 class RateLimiter:
-    """简单的速率限制器"""
+    """简单的速率限制器
+
+    内部记录使用 `time.monotonic()` 单调时钟，不受 NTP 等壁钟跳变影响，
+    单次 C 调用即可取时，也无需先查线程局部的事件循环，便于在无循环的
+    环境（如测试）中使用；`calls` 中的值因此不是壁钟时间戳，只用于计算
+    时间差。
+    """
 
     def __init__(self, max_calls: int, time_window: float):
         """初始化速率限制器
@@ -94,31 +127,40 @@ class RateLimiter:
         """
         self.max_calls = max_calls
         self.time_window = time_window
-        self.calls: List[float] = []
+        self.calls: Deque[float] = deque()
 
     async def acquire(self) -> bool:
         """获取执行权限
-        
+
         Returns:
             bool: 是否获得执行权限
         """
-        now = time.time()
+        now = time.monotonic()
+        calls = self.calls
+        window = self.time_window
 
-        # 清理过期的调用记录
-        self.calls = [call_time for call_time in self.calls if now - call_time < self.time_window]
+        # 调用记录按时间有序，只需从队头弹出过期项，常见情况零分配
+        while calls and now - calls[0] >= window:
+            calls.popleft()
 
         # 检查是否超过限制
-        if len(self.calls) >= self.max_calls:
+        if len(calls) >= self.max_calls:
             return False
 
         # 记录本次调用
-        self.calls.append(now)
+        calls.append(now)
         return True
 
     async def wait_if_needed(self) -> None:
         """如果需要则等待直到可以执行"""
         while not await self.acquire():
-            await asyncio.sleep(0.1)
+            # 精确睡到最早一条记录滑出窗口，避免 100ms 粒度轮询
+            if self.calls:
+                now = time.monotonic()
+                sleep_for = self.time_window - (now - self.calls[0]) + 1e-3
+            else:
+                sleep_for = 0.0
+            await asyncio.sleep(max(0.0, sleep_for))
 
 
 class AsyncTaskManager:
@@ -126,49 +168,49 @@ class AsyncTaskManager:
 
     def __init__(self):
         """初始化任务管理器"""
-        self.tasks: List[asyncio.Task] = []
+        self.tasks: Set[asyncio.Task] = set()
 
     def add_task(self, coro) -> asyncio.Task:
         """添加任务
-        
+
         Args:
             coro: 协程对象
-            
+
         Returns:
             asyncio.Task: 创建的任务
         """
         task = asyncio.create_task(coro)
-        self.tasks.append(task)
+        self.tasks.add(task)
 
-        # 添加完成回调以清理任务列表
+        # 添加完成回调以清理任务集合
         task.add_done_callback(self._task_done_callback)
 
         return task
 
     def _task_done_callback(self, task: asyncio.Task):
         """任务完成回调"""
-        if task in self.tasks:
-            self.tasks.remove(task)
+        self.tasks.discard(task)
 
     async def cancel_all(self):
         """取消所有任务"""
-        for task in self.tasks[:]:  # 创建副本以避免修改时迭代
+        tasks = list(self.tasks)  # 快照，回调会在迭代期间修改集合
+        for task in tasks:
             if not task.done():
                 task.cancel()
 
         # 等待所有任务完成或取消
-        if self.tasks:
-            await asyncio.gather(*self.tasks, return_exceptions=True)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
 
         self.tasks.clear()
 
     def get_active_count(self) -> int:
         """获取活跃任务数量
-        
+
         Returns:
             int: 活跃任务数量
         """
-        return len([task for task in self.tasks if not task.done()])
+        return sum(1 for task in self.tasks if not task.done())
 
 
 # 创建全局任务管理器实例
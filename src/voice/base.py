@@ -1,12 +1,72 @@
 """语音服务提供商抽象基类。"""
 
+import asyncio
 from abc import ABCMeta, abstractmethod
 from io import BytesIO
-from typing import Optional
+from typing import Any, Optional
+
+import aiohttp
 
 
 class _AbstractVoiceProvider(metaclass=ABCMeta):
-    """语音提供商接口基类。"""
+    """语音提供商接口基类。
+
+    同时承载各提供商共用的网络生命周期：持久 HTTP 会话（keep-alive 连接池
+    与 TLS 会话复用）与在飞请求信号量。子类在 ``__init__`` 中调用
+    :meth:`_init_http`，请求前经 :meth:`_get_session` 取会话，并在
+    ``close()`` 中调用 :meth:`_close_session`，连接池参数与关闭语义由此
+    单点维护。
+    """
+
+    def _init_http(
+        self,
+        config: Any,
+        *,
+        timeout: float = 60,
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        """初始化持久会话与并发上限等公共网络状态，子类 ``__init__`` 调用一次。
+
+        Args:
+            config: 含可选 ``max_concurrency`` 属性的配置对象。
+            timeout: 会话总超时秒数；默认 60，本地慢服务（如自建推理）可调大。
+            headers: 作为会话默认请求头的固定头部，可为 None。
+        """
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+        self._session_timeout = timeout
+        self._session_headers = headers
+        # 限制在飞请求数，避免突发调用超过远端吞吐拐点后白付排队延迟。
+        self._sem = asyncio.Semaphore(getattr(config, "max_concurrency", 30))
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """懒创建并复用 HTTP 会话，保持 keep-alive 连接池与 TLS 会话复用。
+
+        Returns:
+            可复用的 `aiohttp.ClientSession` 实例。
+        """
+        if self._session is not None and not self._session.closed:
+            return self._session
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(
+                    headers=self._session_headers,
+                    timeout=aiohttp.ClientTimeout(total=self._session_timeout),
+                    connector=aiohttp.TCPConnector(
+                        limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=60
+                    ),
+                )
+        return self._session
+
+    async def _close_session(self) -> None:
+        """关闭持久 HTTP 会话（若存在），供子类 ``close()`` 调用。
+
+        Returns:
+            None
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     @abstractmethod
     async def close(self) -> None:
@@ -32,6 +92,21 @@ class TTSProvider(_AbstractVoiceProvider):
         """
         raise NotImplementedError
 
+    async def synthesize_many(self, texts: list[str]) -> list[Optional[BytesIO]]:
+        """并发合成多段文本，使各段的网络往返相互重叠。
+
+        各实现内部的并发上限（信号量）仍然生效，扇出不会压垮远端服务。
+
+        Args:
+            texts: 待合成的文本列表。
+
+        Returns:
+            与 ``texts`` 等长、顺序一致的结果列表，失败项为 None。
+        """
+        if not texts:
+            return []
+        return list(await asyncio.gather(*(self.synthesize(text) for text in texts)))
+
     @abstractmethod
     async def close(self) -> None:
         """关闭 TTS 提供商并释放相关资源。
@@ -5,13 +5,20 @@
 """
 
 import asyncio
+import base64
 import hashlib
 import hmac
 import time
 from typing import Any, Optional
+from urllib.parse import quote, urlencode
 
 import aiohttp
 
+try:  # orjson 可选；直接解码原始字节还能跳过 resp.json() 的字符集探测。
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 from ..base import STTProvider
 
 
@@ -40,8 +47,32 @@ class AliyunSTTProvider(STTProvider):
         self._access_key_secret: str = getattr(config, "access_key_secret", "")
         self._app_key: str = getattr(config, "app_key", "")
         self._region: str = getattr(config, "region", "cn-shanghai")
+        # 签名密钥只编码一次，避免每次取 Token 重复拼接。
+        self._hmac_key: bytes = (self._access_key_secret + "&").encode("utf-8")
+        # 识别请求 URL 与取 Token 参数的不变部分在此固化，热路径只补时间戳等字段。
+        gateway_host = f"nls-gateway-{self._region}.aliyuncs.com"
+        self._asr_url: str = (
+            f"https://{gateway_host}/stream/v1/asr"
+            f"?appkey={self._app_key}"
+            f"&format=pcm"
+            f"&sample_rate=16000"
+            f"&enable_punctuation_prediction=true"
+            f"&enable_inverse_text_normalization=true"
+        )
+        self._base_token_params: dict = {
+            "Action": "CreateToken",
+            "Version": "2019-02-28",
+            "AccessKeyId": self._access_key_id,
+            "Format": "JSON",
+            "SignatureMethod": "HMAC-SHA1",
+            "SignatureVersion": "1.0",
+        }
         self._token: Optional[str] = None
         self._token_expire: float = 0
+        # 按秒缓存的签名时间戳，同一秒内的请求不重复走 strftime。
+        self._ts_sec: int = -1
+        self._ts_str: str = ""
+        self._init_http(config)
         self._logger.info(f"阿里云 STT 初始化完成 [区域: {self._region}]")
 
     async def recognize(self, audio_data: bytes) -> Optional[str]:
@@ -63,40 +94,31 @@ class AliyunSTTProvider(STTProvider):
         if not token:
             return None
 
-        gateway_host = f"nls-gateway-{self._region}.aliyuncs.com"
-        url = (
-            f"https://{gateway_host}/stream/v1/asr"
-            f"?appkey={self._app_key}"
-            f"&format=pcm"
-            f"&sample_rate=16000"
-            f"&enable_punctuation_prediction=true"
-            f"&enable_inverse_text_normalization=true"
-        )
+        url = self._asr_url
         headers = {
             "X-NLS-Token": token,
             "Content-Type": "application/octet-stream",
         }
 
         try:
-            timeout = aiohttp.ClientTimeout(total=60)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, data=audio_data, headers=headers) as resp:
-                    if resp.status == 200:
-                        result = await resp.json()
-                        status_code = result.get("status", 0)
-                        if status_code == 20000000:
-                            text = result.get("result", "")
-                            if text:
-                                self._logger.debug(f"阿里云 STT 识别结果: {text}")
-                                return text
-                            return None
-                        self._logger.error(
-                            f"阿里云 STT 服务错误: {status_code} {result.get('message', '')}"
-                        )
+            session = await self._get_session()
+            async with self._sem, session.post(url, data=audio_data, headers=headers) as resp:
+                if resp.status == 200:
+                    result = _json_loads(await resp.read())
+                    status_code = result.get("status", 0)
+                    if status_code == 20000000:
+                        text = result.get("result", "")
+                        if text:
+                            self._logger.debug(f"阿里云 STT 识别结果: {text}")
+                            return text
                         return None
-                    text_err = await resp.text()
-                    self._logger.error(f"阿里云 STT 请求失败: {resp.status} {text_err}")
+                    self._logger.error(
+                        f"阿里云 STT 服务错误: {status_code} {result.get('message', '')}"
+                    )
                     return None
+                text_err = await resp.text()
+                self._logger.error(f"阿里云 STT 请求失败: {resp.status} {text_err}")
+                return None
         except asyncio.TimeoutError:
             self._logger.error("阿里云 STT 请求超时")
             return None
@@ -109,6 +131,7 @@ class AliyunSTTProvider(STTProvider):
 
     async def close(self) -> None:
         """关闭并释放资源。"""
+        await self._close_session()
         self._logger.info("阿里云 STT 提供商已关闭")
 
     async def _ensure_token(self) -> Optional[str]:
@@ -122,41 +145,39 @@ class AliyunSTTProvider(STTProvider):
             return self._token
 
         url = "https://nls-meta.cn-shanghai.aliyuncs.com/"
+        now_sec = int(now)
+        if now_sec != self._ts_sec:
+            self._ts_sec = now_sec
+            self._ts_str = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now_sec))
         params = {
-            "Action": "CreateToken",
-            "Version": "2019-02-28",
-            "AccessKeyId": self._access_key_id,
-            "Timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "Format": "JSON",
-            "SignatureMethod": "HMAC-SHA1",
-            "SignatureVersion": "1.0",
+            **self._base_token_params,
+            "Timestamp": self._ts_str,
             "SignatureNonce": str(int(now * 1000)),
         }
 
-        sorted_params = sorted(params.items())
-        query_string = "&".join(f"{k}={_percent_encode(v)}" for k, v in sorted_params)
+        # urlencode 为 C 实现，quote_via=quote(safe="") 即 RFC 3986 编码。
+        query_string = urlencode(sorted(params.items()), quote_via=quote, safe="")
         string_to_sign = f"GET&{_percent_encode('/')}&{_percent_encode(query_string)}"
-        sign_key = (self._access_key_secret + "&").encode("utf-8")
-        signature = hmac.new(sign_key, string_to_sign.encode("utf-8"), hashlib.sha1)
+        signature = hmac.new(self._hmac_key, string_to_sign.encode("utf-8"), hashlib.sha1)
 
-        import base64
         sig_b64 = base64.b64encode(signature.digest()).decode("utf-8")
         params["Signature"] = sig_b64
 
         try:
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url, params=params) as resp:
-                    if resp.status == 200:
-                        result = await resp.json()
-                        token_data = result.get("Token", {})
-                        self._token = token_data.get("Id")
-                        self._token_expire = token_data.get("ExpireTime", 0)
-                        self._logger.debug("阿里云 Token 获取成功")
-                        return self._token
-                    text_err = await resp.text()
-                    self._logger.error(f"阿里云 Token 获取失败: {resp.status} {text_err}")
-                    return None
+            session = await self._get_session()
+            async with session.get(
+                url, params=params, timeout=aiohttp.ClientTimeout(total=10)
+            ) as resp:
+                if resp.status == 200:
+                    result = _json_loads(await resp.read())
+                    token_data = result.get("Token", {})
+                    self._token = token_data.get("Id")
+                    self._token_expire = token_data.get("ExpireTime", 0)
+                    self._logger.debug("阿里云 Token 获取成功")
+                    return self._token
+                text_err = await resp.text()
+                self._logger.error(f"阿里云 Token 获取失败: {resp.status} {text_err}")
+                return None
         except Exception as exc:
             self._logger.error(f"阿里云 Token 获取异常: {exc}")
             return None
@@ -164,5 +185,4 @@ class AliyunSTTProvider(STTProvider):
 
 def _percent_encode(value: str) -> str:
     """阿里云签名所需的 URL 编码（RFC 3986）。"""
-    import urllib.parse
-    return urllib.parse.quote(str(value), safe="")
+    return quote(str(value), safe="")
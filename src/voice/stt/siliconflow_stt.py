@@ -2,10 +2,16 @@
 
 import asyncio
 import struct
+import uuid
 from typing import Any, Optional
 
 import aiohttp
 
+try:  # orjson 可选；直接解码原始字节还能跳过 resp.json() 的字符集探测。
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 from ..base import STTProvider
 
 
@@ -30,6 +36,23 @@ class SiliconFlowSTTProvider(STTProvider):
         self._api_key: str = getattr(config, "api_key", "")
         self._api_base: str = getattr(config, "api_base", "https://api.siliconflow.cn/v1").rstrip("/")
         self._model: str = getattr(config, "model", "FunAudioLLM/SenseVoiceSmall")
+        # multipart 体的固定前后段只构建一次，每次请求仅拼接音频字节，
+        # 省去 FormData 每次重建 multipart writer 的开销。
+        boundary = uuid.uuid4().hex
+        self._multipart_prefix: bytes = (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="model"\r\n\r\n'
+            f"{self._model}\r\n"
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="audio.wav"\r\n'
+            "Content-Type: audio/wav\r\n\r\n"
+        ).encode("utf-8")
+        self._multipart_suffix: bytes = f"\r\n--{boundary}--\r\n".encode("utf-8")
+        self._headers: dict = {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+        }
+        self._init_http(config)
         self._logger.info(f"SiliconFlow STT 初始化完成 [模型: {self._model}]")
 
     async def recognize(self, audio_data: bytes) -> Optional[str]:
@@ -51,28 +74,21 @@ class SiliconFlowSTTProvider(STTProvider):
 
         try:
             url = f"{self._api_base}/audio/transcriptions"
-            headers = {"Authorization": f"Bearer {self._api_key}"}
-
-            form = aiohttp.FormData()
-            form.add_field("model", self._model)
-            form.add_field(
-                "file", wav_data, filename="audio.wav", content_type="audio/wav"
-            )
-
-            timeout = aiohttp.ClientTimeout(total=60)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, data=form, headers=headers) as resp:
-                    if resp.status == 200:
-                        result = await resp.json()
-                        text = result.get("text", "")
-                        if text:
-                            self._logger.debug(f"识别结果: {text}")
-                            return text
-                        self._logger.debug("未识别到语音")
-                        return None
-                    text_err = await resp.text()
-                    self._logger.error(f"SiliconFlow STT 请求失败: {resp.status} {text_err}")
+            body = b"".join((self._multipart_prefix, wav_data, self._multipart_suffix))
+
+            session = await self._get_session()
+            async with self._sem, session.post(url, data=body, headers=self._headers) as resp:
+                if resp.status == 200:
+                    result = _json_loads(await resp.read())
+                    text = result.get("text", "")
+                    if text:
+                        self._logger.debug(f"识别结果: {text}")
+                        return text
+                    self._logger.debug("未识别到语音")
                     return None
+                text_err = await resp.text()
+                self._logger.error(f"SiliconFlow STT 请求失败: {resp.status} {text_err}")
+                return None
         except asyncio.TimeoutError:
             self._logger.error("SiliconFlow STT 请求超时")
             return None
@@ -84,11 +100,12 @@ class SiliconFlowSTTProvider(STTProvider):
             return None
 
     async def close(self) -> None:
-        """关闭提供商（当前实现仅打日志，无持久连接需释放）。
+        """关闭提供商并释放持久 HTTP 会话。
 
         Returns:
             None
         """
+        await self._close_session()
         self._logger.info("SiliconFlow STT 提供商已关闭")
 
 
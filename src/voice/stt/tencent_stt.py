@@ -15,6 +15,11 @@ from typing import Any, Optional
 
 import aiohttp
 
+try:  # orjson 可选；直接解码原始字节还能跳过 resp.json() 的字符集探测。
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 from ..base import STTProvider
 
 
@@ -43,6 +48,7 @@ class TencentSTTProvider(STTProvider):
         self._secret_key: str = getattr(config, "secret_key", "")
         self._engine: str = getattr(config, "engine", "16k_zh")
         self._region: str = getattr(config, "region", "ap-shanghai")
+        self._init_http(config)
         self._logger.info(f"腾讯云 STT 初始化完成 [引擎: {self._engine}]")
 
     async def recognize(self, audio_data: bytes) -> Optional[str]:
@@ -82,28 +88,27 @@ class TencentSTTProvider(STTProvider):
         headers = self._build_tc3_headers(host, action, version, payload_json)
 
         try:
-            timeout = aiohttp.ClientTimeout(total=60)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    f"https://{host}/", data=payload_json, headers=headers
-                ) as resp:
-                    if resp.status == 200:
-                        result = await resp.json()
-                        response = result.get("Response", {})
-                        if "Error" in response:
-                            err = response["Error"]
-                            self._logger.error(
-                                f"腾讯云 STT 服务错误: {err.get('Code')} {err.get('Message')}"
-                            )
-                            return None
-                        text = response.get("Result", "")
-                        if text:
-                            self._logger.debug(f"腾讯云 STT 识别结果: {text}")
-                            return text
+            session = await self._get_session()
+            async with self._sem, session.post(
+                f"https://{host}/", data=payload_json, headers=headers
+            ) as resp:
+                if resp.status == 200:
+                    result = _json_loads(await resp.read())
+                    response = result.get("Response", {})
+                    if "Error" in response:
+                        err = response["Error"]
+                        self._logger.error(
+                            f"腾讯云 STT 服务错误: {err.get('Code')} {err.get('Message')}"
+                        )
                         return None
-                    text_err = await resp.text()
-                    self._logger.error(f"腾讯云 STT 请求失败: {resp.status} {text_err}")
+                    text = response.get("Result", "")
+                    if text:
+                        self._logger.debug(f"腾讯云 STT 识别结果: {text}")
+                        return text
                     return None
+                text_err = await resp.text()
+                self._logger.error(f"腾讯云 STT 请求失败: {resp.status} {text_err}")
+                return None
         except asyncio.TimeoutError:
             self._logger.error("腾讯云 STT 请求超时")
             return None
@@ -116,6 +121,7 @@ class TencentSTTProvider(STTProvider):
 
     async def close(self) -> None:
         """关闭并释放资源。"""
+        await self._close_session()
         self._logger.info("腾讯云 STT 提供商已关闭")
 
     def _build_tc3_headers(
@@ -2,19 +2,44 @@
 
 import asyncio
 import base64
+import hashlib
 import json
+import time
 from io import BytesIO
-from typing import Any, Optional
+from pathlib import Path
+from typing import Any, ClassVar, Optional
 from urllib.parse import quote, urlsplit, urlunsplit
 
 import aiohttp
 
+try:  # orjson is optional; its C codec is several times faster than stdlib json.
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+from ...utils import debug_enabled
 from ..base import TTSProvider
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Resolved infer_single targets are persisted to disk so a process restart
+# does not pay the /models round trip before the first synthesis.
+_TARGET_CACHE_TTL_SECONDS = 86400
+
 
 class GPTSoVITSTTSProvider(TTSProvider):
     """TTS provider for self-hosted GPT-SoVITS services."""
 
+    _SYNTHESIS_MODES: tuple[str, ...] = ("infer_single",)
+
+    # Resolved targets shared process-wide, keyed by config fingerprint, so a
+    # reconstructed provider (reload, reconnect) skips re-resolution entirely.
+    _TARGET_CACHE: ClassVar[dict[str, dict[str, str]]] = {}
+
     def __init__(self, config: Any, logger: Any) -> None:
         self._logger = logger
         self._api_base: str = getattr(config, "api_base", "http://127.0.0.1:8000").rstrip("/")
@@ -28,9 +53,22 @@ class GPTSoVITSTTSProvider(TTSProvider):
         )
         self._template_emotion: str = str(getattr(config, "voice", "") or "").strip()
         self._cached_infer_single_target: Optional[dict[str, str]] = None
+        self._target_lock = asyncio.Lock()
+        # Longer timeout than the cloud providers: the (usually single-GPU)
+        # backend can take a while on long texts.
+        self._init_http(config, timeout=120)
         self._text_lang: str = str(getattr(config, "text_lang", "zh") or "zh").strip()
         self._response_format: str = str(getattr(config, "response_format", "wav") or "wav").strip()
         self._speed_factor: float = float(getattr(config, "speed_factor", 1.0) or 1.0)
+        self._target_fingerprint: str = "|".join(
+            (
+                self._api_base,
+                self._version,
+                self._template_model_name,
+                self._template_emotion,
+                self._text_lang,
+            )
+        )
         self._last_error: str = ""
         self._log_initial_configuration()
 
@@ -59,7 +97,20 @@ class GPTSoVITSTTSProvider(TTSProvider):
         )
 
     def _determine_synthesis_modes(self) -> tuple[str, ...]:
-        return ("infer_single",)
+        return self._SYNTHESIS_MODES
+
+    async def warmup(self) -> None:
+        """Resolve the infer_single target ahead of the first synthesis.
+
+        Moves the /models round trip off the user-facing path so the first
+        utterance pays the same latency as the Nth; failures are logged and
+        retried lazily by the next synthesize call.
+        """
+        try:
+            session = await self._get_session()
+            await self._resolve_infer_single_target(session)
+        except Exception as exc:
+            self._logger.debug(f"GPT-SoVITS warmup skipped: {exc}")
 
     async def synthesize(self, text: str) -> Optional[BytesIO]:
         if not text:
@@ -71,14 +122,15 @@ class GPTSoVITSTTSProvider(TTSProvider):
             modes = self._determine_synthesis_modes()
             if not modes:
                 return None
-            self._logger.debug(
-                "GPT-SoVITS synthesis requested "
-                f"[chars={len(text)}, mode={modes[0]}, version={self._version}, "
-                f"explicit_template={bool(self._template_model_name)}, response_format={self._response_format}, "
-                f"speed_factor={self._speed_factor}]"
-            )
-            timeout = aiohttp.ClientTimeout(total=120)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            if debug_enabled(self._logger):
+                self._logger.debug(
+                    "GPT-SoVITS synthesis requested "
+                    f"[chars={len(text)}, mode={modes[0]}, version={self._version}, "
+                    f"explicit_template={bool(self._template_model_name)}, response_format={self._response_format}, "
+                    f"speed_factor={self._speed_factor}]"
+                )
+            session = await self._get_session()
+            async with self._sem:
                 return await self._run_synthesis_sequence(session, text)
         except asyncio.TimeoutError:
             self._set_last_error("request timed out")
@@ -111,6 +163,11 @@ class GPTSoVITSTTSProvider(TTSProvider):
             return audio
 
         self._log_service_payload_error("infer_single", payload)
+        # A service-side rejection often means the resolved model/emotion no
+        # longer exists (e.g. the model was deleted or renamed); drop every
+        # cache layer so the next attempt re-discovers the target instead of
+        # failing on the stale one until the disk TTL expires.
+        self._invalidate_cached_target()
         final_message = "synthesis failed in infer_single mode"
         self._set_last_error(final_message)
         self._logger.error(f"GPT-SoVITS {final_message}")
@@ -136,13 +193,14 @@ class GPTSoVITSTTSProvider(TTSProvider):
             "speed_facter": self._speed_factor,
             "media_type": self._response_format,
         }
-        self._logger.debug(
-            "GPT-SoVITS infer_single request prepared "
-            f"[url={url}, model={target['model_name']}, language={target['language']}, emotion={target['emotion']}, "
-            f"text_lang={target['language']}, media_type={self._response_format}]"
-        )
+        if debug_enabled(self._logger):
+            self._logger.debug(
+                "GPT-SoVITS infer_single request prepared "
+                f"[url={url}, model={target['model_name']}, language={target['language']}, emotion={target['emotion']}, "
+                f"text_lang={target['language']}, media_type={self._response_format}]"
+            )
 
-        async with session.post(url, json=payload) as resp:
+        async with session.post(url, data=_json_dumps(payload), headers=_JSON_HEADERS) as resp:
             if resp.status != 200:
                 response_text = await resp.text()
                 self._set_last_error(
@@ -168,10 +226,11 @@ class GPTSoVITSTTSProvider(TTSProvider):
     ) -> tuple[Optional[BytesIO], Any]:
         data = await resp.read()
         content_type = (resp.headers.get("Content-Type") or "").lower()
-        self._logger.debug(
-            f"GPT-SoVITS {request_name} response received "
-            f"[status={resp.status}, content_type={content_type or '<empty>'}, bytes={len(data)}]"
-        )
+        if debug_enabled(self._logger):
+            self._logger.debug(
+                f"GPT-SoVITS {request_name} response received "
+                f"[status={resp.status}, content_type={content_type or '<empty>'}, bytes={len(data)}]"
+            )
 
         if self._looks_like_audio_payload(data, content_type):
             self._logger.debug(
@@ -227,24 +286,64 @@ class GPTSoVITSTTSProvider(TTSProvider):
                     f"GPT-SoVITS output download failed: {resp.status} {response_text}"
                 )
                 return None
-            data = await resp.read()
-            if not data:
+            # Stream chunks straight into the buffer instead of holding a
+            # duplicate bytes object for multi-MB wavs; pre-size it from
+            # Content-Length so the write loop does not pay growable-buffer
+            # reallocations.
+            try:
+                declared = int(resp.headers.get("Content-Length", 0))
+            except ValueError:
+                declared = 0
+            buffer = BytesIO(bytes(declared)) if declared > 0 else BytesIO()
+            async for chunk in resp.content.iter_chunked(64 * 1024):
+                buffer.write(chunk)
+            if buffer.tell() == 0:
                 self._set_last_error("output download returned empty body")
                 self._logger.error("GPT-SoVITS output download returned empty body")
                 return None
-            return BytesIO(data)
+            buffer.truncate()
+            buffer.seek(0)
+            return buffer
 
     async def _resolve_infer_single_target(
         self, session: aiohttp.ClientSession
     ) -> Optional[dict[str, str]]:
         if self._cached_infer_single_target is not None:
+            # Steady-state fast path: skip the f-string build unless DEBUG is on.
+            if debug_enabled(self._logger):
+                self._logger.debug(
+                    "GPT-SoVITS using cached infer_single target "
+                    f"[model={self._cached_infer_single_target['model_name']}, "
+                    f"language={self._cached_infer_single_target['language']}, "
+                    f"emotion={self._cached_infer_single_target['emotion']}]"
+                )
+            return self._cached_infer_single_target
+
+        shared_target = self._TARGET_CACHE.get(self._target_fingerprint)
+        if shared_target is not None:
+            self._cached_infer_single_target = shared_target
+            return shared_target
+
+        # Coalesce cold-start resolution: simultaneous callers should trigger
+        # one /models fetch, not one each.
+        async with self._target_lock:
+            if self._cached_infer_single_target is not None:
+                return self._cached_infer_single_target
+            return await self._resolve_infer_single_target_uncached(session)
+
+    async def _resolve_infer_single_target_uncached(
+        self, session: aiohttp.ClientSession
+    ) -> Optional[dict[str, str]]:
+        disk_target = self._load_cached_target()
+        if disk_target is not None:
             self._logger.debug(
-                "GPT-SoVITS using cached infer_single target "
-                f"[model={self._cached_infer_single_target['model_name']}, "
-                f"language={self._cached_infer_single_target['language']}, "
-                f"emotion={self._cached_infer_single_target['emotion']}]"
+                "GPT-SoVITS using disk-cached infer_single target "
+                f"[model={disk_target['model_name']}, language={disk_target['language']}, "
+                f"emotion={disk_target['emotion']}]"
             )
-            return self._cached_infer_single_target
+            self._cached_infer_single_target = disk_target
+            self._TARGET_CACHE[self._target_fingerprint] = disk_target
+            return disk_target
 
         url = f"{self._api_base}/models/{quote(self._version, safe='')}"
         self._logger.debug(f"GPT-SoVITS requesting infer_single model list: {url}")
@@ -259,8 +358,8 @@ class GPTSoVITSTTSProvider(TTSProvider):
                 )
                 return None
             try:
-                payload = json.loads(await resp.text())
-            except json.JSONDecodeError:
+                payload = _json_loads(await resp.read())
+            except ValueError:
                 self._set_last_error("model list response is not valid JSON")
                 self._logger.warning("GPT-SoVITS model list response is not valid JSON")
                 return None
@@ -308,8 +407,51 @@ class GPTSoVITSTTSProvider(TTSProvider):
             "language": language,
             "emotion": emotion,
         }
+        self._TARGET_CACHE[self._target_fingerprint] = self._cached_infer_single_target
+        self._store_cached_target(self._cached_infer_single_target)
         return self._cached_infer_single_target
 
+    def _target_cache_path(self) -> Path:
+        """Return the cache file path, keyed by the config that shaped resolution."""
+        digest = hashlib.md5(self._target_fingerprint.encode("utf-8")).hexdigest()[:12]
+        return Path(__file__).resolve().parents[3] / "cache" / f"gptsovits_target_{digest}.json"
+
+    def _load_cached_target(self) -> Optional[dict[str, str]]:
+        """Load a previously resolved target from disk if fresh enough."""
+        path = self._target_cache_path()
+        try:
+            if time.time() - path.stat().st_mtime >= _TARGET_CACHE_TTL_SECONDS:
+                return None
+            data = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        keys = ("model_name", "language", "emotion")
+        if not isinstance(data, dict) or not all(
+            isinstance(data.get(key), str) and data.get(key) for key in keys
+        ):
+            return None
+        return {key: data[key] for key in keys}
+
+    def _store_cached_target(self, target: dict[str, str]) -> None:
+        """Persist the resolved target atomically; cache failures are non-fatal."""
+        path = self._target_cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(target, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(path)
+        except OSError as exc:
+            self._logger.debug(f"GPT-SoVITS target cache write skipped: {exc}")
+
+    def _invalidate_cached_target(self) -> None:
+        """Drop the cached target from memory and disk after a service error."""
+        self._cached_infer_single_target = None
+        self._TARGET_CACHE.pop(self._target_fingerprint, None)
+        try:
+            self._target_cache_path().unlink()
+        except OSError:
+            pass
+
     def _pick_model_name(self, models: dict[str, Any]) -> Optional[str]:
         configured = self._template_model_name
         if configured:
@@ -416,8 +558,8 @@ class GPTSoVITSTTSProvider(TTSProvider):
         if not text:
             return None
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return _json_loads(text)
+        except ValueError:
             return text
 
     def _extract_service_error_message(self, payload: Any) -> str:
@@ -567,4 +709,5 @@ class GPTSoVITSTTSProvider(TTSProvider):
         return alias_map.get(text.lower(), text)
 
     async def close(self) -> None:
+        await self._close_session()
         self._logger.info("GPT-SoVITS TTS provider closed")
@@ -1,12 +1,23 @@
 """MiniMax TTS 提供商实现。"""
 
 import asyncio
+import json
 import wave
 from io import BytesIO
 from typing import Any, Optional
 
 import aiohttp
 
+try:  # orjson 可选；其 C 实现编解码比标准库快数倍，缺席时回退 json。
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+from ...utils import debug_enabled
 from ..base import TTSProvider
 
 
@@ -37,6 +48,31 @@ class MiniMaxTTSProvider(TTSProvider):
         self._sample_rate: int = getattr(config, "audio_sample_rate", 48000)
         self._audio_format: str = str(getattr(config, "output_format", "mp3") or "mp3").strip().lower()
         self._normalize_audio_options()
+        # 请求头与载荷的不变部分只构建一次，每次合成仅补 text。
+        self._headers = {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json",
+        }
+        self._base_payload = {
+            "model": self._model,
+            "stream": False,
+            "output_format": "hex",
+            "voice_setting": {
+                "voice_id": self._voice_id,
+                "speed": self._speed,
+                "vol": self._vol,
+                "pitch": self._pitch,
+            },
+            "audio_setting": {
+                "sample_rate": self._sample_rate,
+                "bitrate": 128000,
+                "format": self._audio_format,
+                "channel": 1,
+            },
+        }
+        # 载荷不变部分预序列化为字节，每次请求只编码 text 字段再拼接。
+        self._payload_prefix: bytes = _json_dumps(self._base_payload)[:-1]
+        self._init_http(config, headers=self._headers)
         self._logger.info(
             "MiniMax TTS 初始化完成 "
             f"[模型: {self._model}, 音色: {self._voice_id}, 格式: {self._audio_format}, 采样率: {self._sample_rate}]"
@@ -84,35 +120,16 @@ class MiniMaxTTSProvider(TTSProvider):
             return None
 
         url = f"{self._api_base}/v1/t2a_v2"
-        headers = {
-            "Authorization": f"Bearer {self._api_key}",
-            "Content-Type": "application/json",
-        }
-        payload = {
-            "model": self._model,
-            "text": text,
-            "stream": False,
-            "output_format": "hex",
-            "voice_setting": {
-                "voice_id": self._voice_id,
-                "speed": self._speed,
-                "vol": self._vol,
-                "pitch": self._pitch,
-            },
-            "audio_setting": {
-                "sample_rate": self._sample_rate,
-                "bitrate": 128000,
-                "format": self._audio_format,
-                "channel": 1,
-            },
-        }
+        body = b"".join(
+            (self._payload_prefix, b', "text": ', _json_dumps(text), b"}")
+        )
 
         try:
-            timeout = aiohttp.ClientTimeout(total=60)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, json=payload, headers=headers) as resp:
+            session = await self._get_session()
+            async with self._sem:
+                async with session.post(url, data=body) as resp:
                     if resp.status == 200:
-                        result = await resp.json()
+                        result = _json_loads(await resp.read())
                         base_resp = result.get("base_resp", {})
                         status_code = base_resp.get("status_code", 0)
                         if status_code:
@@ -128,9 +145,11 @@ class MiniMaxTTSProvider(TTSProvider):
                         audio_bytes = bytes.fromhex(audio_hex)
                         if self._audio_format == "pcm":
                             audio_bytes = self._wrap_pcm_as_wav(audio_bytes)
-                        self._logger.debug(
-                            f"MiniMax TTS 合成成功: {text[:50]}... ({len(audio_bytes)} bytes)"
-                        )
+                        # DEBUG 未开启时不做文本切片与 f-string 拼接。
+                        if debug_enabled(self._logger):
+                            self._logger.debug(
+                                f"MiniMax TTS 合成成功: {text[:50]}... ({len(audio_bytes)} bytes)"
+                            )
                         return BytesIO(audio_bytes)
                     text_err = await resp.text()
                     self._logger.error(f"MiniMax TTS 请求失败: {resp.status} {text_err}")
@@ -146,9 +165,10 @@ class MiniMaxTTSProvider(TTSProvider):
             return None
 
     async def close(self) -> None:
-        """关闭提供商（当前实现仅打日志，无持久连接需释放）。
+        """关闭提供商并释放持久 HTTP 会话。
 
         Returns:
             None
         """
+        await self._close_session()
         self._logger.info("MiniMax TTS 提供商已关闭")
@@ -1,14 +1,28 @@
 """SiliconFlow TTS 提供商实现。"""
 
 import asyncio
+import json
+import re
 import wave
 from io import BytesIO
 from typing import Any, Optional
 
 import aiohttp
 
+try:  # orjson 可选；其 C 实现编解码比标准库快数倍，缺席时回退 json。
+    from orjson import dumps as _json_dumps
+except ImportError:
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+from ...utils import debug_enabled
 from ..base import TTSProvider
 
+# 单次扫描判断文本是否已带 [S1]/[S2] 说话人标记。
+_HAS_SPEAKER_TAG = re.compile(r"\[S[12]\]").search
+
 
 class SiliconFlowTTSProvider(TTSProvider):
     """SiliconFlow TTS 提供商。
@@ -31,10 +45,27 @@ class SiliconFlowTTSProvider(TTSProvider):
         self._api_base: str = getattr(config, "api_base", "https://api.siliconflow.cn/v1").rstrip("/")
         self._model: str = getattr(config, "model", "fnlp/MOSS-TTSD-v0.5")
         self._voice: str = getattr(config, "voice", "fnlp/MOSS-TTSD-v0.5:alex")
-        self._response_format: str = str(getattr(config, "response_format", "wav") or "wav").strip().lower()
+        # 默认 mp3：相比 wav/pcm 线上传输体积小一个数量级，播放链路可直接解码。
+        self._response_format: str = str(getattr(config, "response_format", "mp3") or "mp3").strip().lower()
         self._sample_rate: int = int(getattr(config, "sample_rate", 32000))
         self._speed: float = getattr(config, "speed", 1.0)
         self._normalize_audio_options()
+        # 请求头与载荷的不变部分只构建一次，每次合成仅补 input。
+        self._headers = {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json",
+        }
+        self._base_payload = {
+            "model": self._model,
+            "voice": self._voice,
+            "response_format": self._response_format,
+            "sample_rate": self._sample_rate,
+            "speed": self._speed,
+            "stream": False,
+        }
+        # 载荷不变部分预序列化为字节，每次请求只编码 input 字段再拼接。
+        self._payload_prefix: bytes = _json_dumps(self._base_payload)[:-1]
+        self._init_http(config, headers=self._headers)
         self._logger.info(
             "SiliconFlow TTS 初始化完成 "
             f"[模型: {self._model}, 音色: {self._voice}, 格式: {self._response_format}, 采样率: {self._sample_rate}]"
@@ -95,36 +126,42 @@ class SiliconFlowTTSProvider(TTSProvider):
             self._logger.error("SiliconFlow API 密钥未配置")
             return None
 
-        if "[S1]" not in text and "[S2]" not in text:
+        if _HAS_SPEAKER_TAG(text) is None:
             text = f"[S1]{text}"
 
         url = f"{self._api_base}/audio/speech"
-        headers = {
-            "Authorization": f"Bearer {self._api_key}",
-            "Content-Type": "application/json",
-        }
-        payload = {
-            "model": self._model,
-            "input": text,
-            "voice": self._voice,
-            "response_format": self._response_format,
-            "sample_rate": self._sample_rate,
-            "speed": self._speed,
-            "stream": False,
-        }
+        body = b"".join(
+            (self._payload_prefix, b', "input": ', _json_dumps(text), b"}")
+        )
 
         try:
-            timeout = aiohttp.ClientTimeout(total=60)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, json=payload, headers=headers) as resp:
+            session = await self._get_session()
+            async with self._sem:
+                async with session.post(url, data=body) as resp:
                     if resp.status == 200:
-                        data = await resp.read()
+                        # 分块写入内存流，避免 bytes + BytesIO 的双份缓冲；
+                        # 按 Content-Length 预分配，流式写入时免去缓冲扩容。
+                        try:
+                            declared = int(resp.headers.get("Content-Length", 0))
+                        except ValueError:
+                            declared = 0
+                        buffer = BytesIO(bytes(declared)) if declared > 0 else BytesIO()
+                        async for chunk in resp.content.iter_chunked(64 * 1024):
+                            buffer.write(chunk)
+                        size = buffer.tell()
+                        buffer.truncate()
                         if self._response_format == "pcm":
-                            data = self._wrap_pcm_as_wav(data)
-                        self._logger.debug(
-                            f"SiliconFlow TTS 合成成功: {text[:50]}... ({len(data)} bytes)"
-                        )
-                        return BytesIO(data)
+                            wav_data = self._wrap_pcm_as_wav(buffer.getvalue())
+                            size = len(wav_data)
+                            buffer = BytesIO(wav_data)
+                        else:
+                            buffer.seek(0)
+                        # DEBUG 未开启时不做文本切片与 f-string 拼接。
+                        if debug_enabled(self._logger):
+                            self._logger.debug(
+                                f"SiliconFlow TTS 合成成功: {text[:50]}... ({size} bytes)"
+                            )
+                        return buffer
                     text_err = await resp.text()
                     self._logger.error(f"SiliconFlow TTS 请求失败: {resp.status} {text_err}")
                     return None
@@ -139,9 +176,10 @@ class SiliconFlowTTSProvider(TTSProvider):
             return None
 
     async def close(self) -> None:
-        """关闭提供商（当前实现仅打日志，无持久连接需释放）。
+        """关闭提供商并释放持久 HTTP 会话。
 
         Returns:
             None
         """
+        await self._close_session()
         self._logger.info("SiliconFlow TTS 提供商已关闭")
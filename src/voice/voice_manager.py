@@ -6,24 +6,104 @@ from __future__ import annotations
 """
 
 import asyncio
+import hashlib
 import io
 import math
-import subprocess
 import time as _time
 import wave
 import numpy as np
-import traceback
+from collections import OrderedDict
 from typing import Any, Awaitable, Callable, Optional
 
 import discord
 from discord import VoiceClient
 from discord.ext import voice_recv
 
+try:  # scipy 可选；缺席时音频转换退回 FFmpeg 子进程管道。
+    from scipy.signal import resample_poly as _resample_poly
+except ImportError:
+    _resample_poly = None
+
 from ...constants import DEFAULT_TTS_PLAYBACK_LEADING_SILENCE_MS
+from ..utils import log_debug_traceback
 from .base import STTProvider, TTSProvider
 
 VoiceConnectableChannel = discord.VoiceChannel | discord.StageChannel
 
+# 相同文本的合成结果缓存上限；机器人常用的固定短语命中后免去整次 TTS 网络调用。
+TTS_SYNTH_CACHE_SIZE = 256
+
+# 每用户捕获缓冲的初始容量；写入溢出时按倍增扩容，避免逐包几何重分配。
+_USER_BUFFER_INITIAL_SIZE = 1 << 20
+
+# 每用户捕获缓冲的容量上限：60 秒 @ 48kHz 立体声 16-bit。达到上限后按环形
+# 缓冲丢弃最旧数据——长时间不触发 STT 的用户以丢失最早的音频换取内存有界。
+_USER_BUFFER_MAX_SIZE = 48000 * 2 * 2 * 60
+
+# STT 前置门控：时长或能量低于阈值的片段视为误触/底噪，直接丢弃，
+# 省去整条转码 + 网络识别链路。RMS 以 16-bit 幅度为参考。
+_MIN_UTTERANCE_SECONDS = 0.3
+_MIN_UTTERANCE_RMS = 200.0
+
+
+class _UserBuf:
+    """单用户捕获缓冲：倍增扩容到上限后退化为环形缓冲，溢出时丢弃最旧数据。"""
+
+    __slots__ = ("buf", "mv", "start", "size")
+
+    def __init__(self) -> None:
+        self.buf = bytearray(_USER_BUFFER_INITIAL_SIZE)
+        # 常驻 memoryview，扩容（整体换新 bytearray）时同步刷新；
+        # 写入与取出都经它切片，不必每帧重新构造视图。
+        self.mv = memoryview(self.buf)
+        self.start = 0
+        self.size = 0
+
+    def append(self, pcm: bytes) -> None:
+        """追加一帧 PCM；容量封顶后覆盖最旧字节，保证内存有界。"""
+        n = len(pcm)
+        if n >= _USER_BUFFER_MAX_SIZE:
+            pcm = pcm[-_USER_BUFFER_MAX_SIZE:]
+            n = len(pcm)
+        cap = len(self.buf)
+        if self.size + n > cap and cap < _USER_BUFFER_MAX_SIZE:
+            new_cap = min(max(cap * 2, self.size + n), _USER_BUFFER_MAX_SIZE)
+            new_buf = bytearray(new_cap)
+            new_buf[: self.size] = self._linearized()
+            self.buf = new_buf
+            self.mv = memoryview(new_buf)
+            self.start = 0
+            cap = new_cap
+        if self.size + n > cap:
+            overflow = self.size + n - cap
+            self.start = (self.start + overflow) % cap
+            self.size -= overflow
+        end = (self.start + self.size) % cap
+        first = min(n, cap - end)
+        if first == n:
+            self.mv[end : end + n] = pcm
+        else:
+            # 环形回绕：经 memoryview 切源数据，不产生中间 bytes 拷贝。
+            src = memoryview(pcm)
+            self.mv[end : end + first] = src[:first]
+            self.mv[: n - first] = src[first:]
+        self.size += n
+
+    def _linearized(self) -> bytes:
+        """按写入顺序拼出当前内容（环形时合并两段切片）。"""
+        cap = len(self.buf)
+        end = self.start + self.size
+        if end <= cap:
+            return bytes(self.mv[self.start : end])
+        return b"".join((self.mv[self.start :], self.mv[: end - cap]))
+
+    def drain(self) -> bytes:
+        """取出全部内容并清空，缓冲区本身保留复用。"""
+        data = self._linearized()
+        self.start = 0
+        self.size = 0
+        return data
+
 
 class VoiceDataSink(voice_recv.AudioSink):  # type: ignore
     """语音数据接收器。
@@ -40,7 +120,8 @@ class VoiceDataSink(voice_recv.AudioSink):  # type: ignore
         """
         super().__init__()
         self.voice_manager = voice_manager
-        self.user_audio_buffers: dict[int, io.BytesIO] = {}
+        # 每用户一个 _UserBuf；write 每帧触发，单对象避免双 dict 查找。
+        self.user_audio_buffers: dict[int, _UserBuf] = {}
         self.active_speakers: set[int] = set()
 
     def wants_opus(self) -> bool:
@@ -52,31 +133,48 @@ class VoiceDataSink(voice_recv.AudioSink):  # type: ignore
         return False
 
     def write(self, user: Any, data: Any) -> None:
-        """接收一帧用户音频并写入对应用户的缓冲，同时通知 VAD 处理。
+        """首包慢路径：探测数据包形状，确认带 ``pcm`` 后特化到快路径。
+
+        回调对象的形状在一次会话内稳定，探测一次即可；之后把实例的
+        ``write`` 重绑定为 :meth:`_write_pcm`，后续每 20ms 包免去 hasattr。
 
         Args:
             user: 说话用户对象或用户 ID（兼容两种形式）。
             data: 含 pcm 属性的数据包，或库约定的音频数据对象。
         """
+        if hasattr(data, "pcm"):
+            self.write = self._write_pcm  # type: ignore[method-assign]
+            self._write_pcm(user, data)
+            return
         user_id = user.id if hasattr(user, "id") else user
         if user_id not in self.user_audio_buffers:
-            self.user_audio_buffers[user_id] = io.BytesIO()
-        pcm_bytes: bytes = b""
-        if hasattr(data, "pcm"):
-            pcm_bytes = data.pcm
-            self.user_audio_buffers[user_id].write(pcm_bytes)
+            self.user_audio_buffers[user_id] = _UserBuf()
+        self.active_speakers.add(user_id)
+
+    def _write_pcm(self, user: Any, data: Any) -> None:
+        """快路径：直接访问 ``data.pcm`` 写入缓冲并通知 VAD。
+
+        Args:
+            user: 说话用户对象或用户 ID（兼容两种形式）。
+            data: 含 pcm 属性的数据包。
+        """
+        user_id = user.id if hasattr(user, "id") else user
+        ub = self.user_audio_buffers.get(user_id)
+        if ub is None:
+            ub = self.user_audio_buffers[user_id] = _UserBuf()
+        pcm_bytes: bytes = data.pcm
+        if pcm_bytes:
+            ub.append(pcm_bytes)
         self.active_speakers.add(user_id)
         if pcm_bytes:
             self.voice_manager._on_vad_frame(user, user_id, pcm_bytes)
 
     def cleanup(self) -> None:
-        """关闭所有用户缓冲并清空状态，在停止监听时调用。
+        """清空所有用户缓冲与状态，在停止监听时调用。
 
         Returns:
             None
         """
-        for buffer in self.user_audio_buffers.values():
-            buffer.close()
         self.user_audio_buffers.clear()
         self.active_speakers.clear()
 
@@ -89,19 +187,18 @@ class VoiceDataSink(voice_recv.AudioSink):  # type: ignore
         Returns:
             该用户自上次清空以来累积的音频字节；无缓冲时返回空 bytes。
         """
-        buffer = self.user_audio_buffers.get(user_id)
-        if buffer:
-            data = buffer.getvalue()
-            buffer.seek(0)
-            buffer.truncate()
-            return data
-        return b""
+        ub = self.user_audio_buffers.get(user_id)
+        if ub is None:
+            return b""
+        return ub.drain()
 
 
-def convert_audio_to_pcm(audio_data: bytes, logger: Any) -> bytes:
+async def convert_audio_to_pcm(audio_data: bytes, logger: Any) -> bytes:
     """将 Discord 侧 PCM（48kHz 立体声 s16le）转为 16kHz 单声道 PCM，供 STT 使用。
 
-    通过 FFmpeg 管道转换；若 FFmpeg 不可用或转换失败，则记录日志并原样返回输入。
+    优先走进程内 NumPy/SciPy 重采样（声道平均 + 48k→16k 三抽一），足够快可以
+    直接在事件循环内完成；scipy 缺席或转换异常时退回 FFmpeg，以 asyncio 子进程
+    流式读写管道，不阻塞事件循环。两条路径都失败则记录日志并原样返回输入。
 
     Args:
         audio_data: 原始 PCM 字节流。
@@ -110,20 +207,32 @@ def convert_audio_to_pcm(audio_data: bytes, logger: Any) -> bytes:
     Returns:
         转换后的 PCM 字节；失败时返回未修改的 audio_data。
     """
+    if _resample_poly is not None:
+        try:
+            samples = np.frombuffer(audio_data, dtype="<i2")
+            samples = samples[: (samples.size // 2) * 2]
+            if samples.size == 0:
+                return b""
+            stereo = samples.reshape(-1, 2).astype(np.int32)
+            mono = ((stereo[:, 0] + stereo[:, 1]) >> 1).astype(np.int16)
+            down = _resample_poly(mono, 1, 3)
+            return np.clip(down, -32768, 32767).astype(np.int16).tobytes()
+        except Exception as exc:
+            logger.error(f"进程内音频重采样失败，回退 FFmpeg: {exc}")
+
     try:
-        process = subprocess.Popen(
-            [
-                "ffmpeg",
-                "-f", "s16le", "-ar", "48000", "-ac", "2",
-                "-i", "pipe:0",
-                "-f", "s16le", "-ar", "16000", "-ac", "1",
-                "pipe:1",
-            ],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-hide_banner", "-loglevel", "error",
+            "-f", "s16le", "-ar", "48000", "-ac", "2",
+            "-i", "pipe:0",
+            "-f", "s16le", "-ar", "16000", "-ac", "1",
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
-        pcm_data, stderr = process.communicate(input=audio_data)
+        pcm_data, stderr = await process.communicate(input=audio_data)
         if process.returncode != 0:
             logger.error(f"FFmpeg 转换失败: {stderr.decode()}")
             return audio_data
@@ -136,6 +245,18 @@ def convert_audio_to_pcm(audio_data: bytes, logger: Any) -> bytes:
         return audio_data
 
 
+def _has_human_members(channel: VoiceConnectableChannel) -> bool:
+    """判断频道内是否有真人成员；首个非机器人即短路，不遍历完整成员列表。
+
+    Args:
+        channel: 待检查的语音/舞台频道。
+
+    Returns:
+        频道内存在非机器人成员为 True。
+    """
+    return any(not m.bot for m in channel.members)
+
+
 def _frame_db(pcm_bytes: bytes) -> float:
     """计算一帧 PCM 音频的 RMS 分贝值。
 
@@ -166,7 +287,8 @@ def _detect_audio_format(data: bytes) -> str:
     """
     if data[:4] == b"RIFF" and len(data) >= 12 and data[8:12] == b"WAVE":
         return "wav"
-    if data[:3] == b"ID3" or (len(data) >= 2 and data[:2] == b"\xff\xfb"):
+    # MP3：ID3 标签头，或任意 MPEG 音频帧同步字（0xFF 后跟 0b111xxxxx）。
+    if data[:3] == b"ID3" or (len(data) >= 2 and data[0] == 0xFF and (data[1] & 0xE0) == 0xE0):
         return "mp3"
     if data[:4] == b"fLaC":
         return "flac"
@@ -289,8 +411,13 @@ class VoiceManager:
         self._current_channel_id: Optional[int] = None
         self._running = False
         self._idle_timer_task: Optional[asyncio.Task[None]] = None
+        self._warmup_task: Optional[asyncio.Task[None]] = None
 
         self._voice_sink: Optional[VoiceDataSink] = None
+        # 关麦触发的在飞 STT 任务引用，防止被垃圾回收提前取消。
+        self._stt_tasks: set[asyncio.Task[None]] = set()
+        # 文本 -> 合成音频字节的 LRU，key 为文本摘要。
+        self._synth_cache: OrderedDict[bytes, bytes] = OrderedDict()
 
         self._enable_vad = enable_vad
         self._vad_threshold_db = vad_threshold_db
@@ -316,6 +443,11 @@ class VoiceManager:
         """
         self._running = True
 
+        warmup = getattr(self.tts_provider, "warmup", None)
+        if warmup is not None:
+            # 后台预热提供商（如解析合成目标），把冷启动往返挪出首次播报路径。
+            self._warmup_task = asyncio.create_task(warmup())
+
         if self._voice_mode == "fixed":
             if not self._fixed_channel_id:
                 self._logger.warning("固定模式但未配置频道 ID")
@@ -342,6 +474,9 @@ class VoiceManager:
             None
         """
         self._running = False
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+            self._warmup_task = None
         self._cancel_idle_timer()
         await self.disconnect()
         self._logger.info("语音管理器已停止")
@@ -502,7 +637,7 @@ class VoiceManager:
                 f"channel_id={channel_id}, channel={channel_name}, "
                 f"type={channel_type}, error={exc}"
             )
-            self._logger.debug(traceback.format_exc())
+            log_debug_traceback(self._logger)
             return False
 
     async def disconnect(self) -> None:
@@ -589,7 +724,11 @@ class VoiceManager:
 
         if not was_muted and is_muted and before.channel:
             if self._voice_sink and self.stt_provider:
-                await self._process_user_audio(member)
+                # 后台任务化：多个用户几乎同时关麦时各自的转码 + 识别往返
+                # 相互重叠，不在事件处理器里串行等待。
+                task = asyncio.create_task(self._process_user_audio(member))
+                self._stt_tasks.add(task)
+                task.add_done_callback(self._stt_tasks.discard)
 
     async def _handle_auto_mode_state_change(
         self,
@@ -603,8 +742,7 @@ class VoiceManager:
 
         if joined_channel and joined_channel.id in self._auto_channel_list:
             if not self.is_connected():
-                human_count = sum(1 for m in joined_channel.members if not m.bot)
-                if human_count > 0:
+                if _has_human_members(joined_channel):
                     self._cancel_idle_timer()
                     await self.connect(joined_channel.id)
             elif self._current_channel_id == joined_channel.id:
@@ -612,9 +750,7 @@ class VoiceManager:
 
         if left_channel and self._current_channel_id == left_channel.id:
             if isinstance(left_channel, (discord.VoiceChannel, discord.StageChannel)):
-                channel = left_channel
-                human_count = sum(1 for m in channel.members if not m.bot)
-                if human_count == 0:
+                if not _has_human_members(left_channel):
                     self._start_idle_timer()
 
     def _start_idle_timer(self) -> None:
@@ -638,11 +774,9 @@ class VoiceManager:
 
             if self._current_channel_id:
                 channel = await self._resolve_voice_channel(self._current_channel_id)
-                if channel is not None:
-                    human_count = sum(1 for m in channel.members if not m.bot)
-                    if human_count > 0:
-                        self._logger.info("超时前有人加入，取消退出")
-                        return
+                if channel is not None and _has_human_members(channel):
+                    self._logger.info("超时前有人加入，取消退出")
+                    return
 
             self._logger.info("空闲超时，自动退出语音频道")
             await self.disconnect()
@@ -664,6 +798,7 @@ class VoiceManager:
             self._logger.error("TTS 播放请求被忽略：未配置 TTS provider")
             return False
 
+        synth_task: Optional[asyncio.Task[Any]] = None
         try:
             provider_name = type(self.tts_provider).__name__
             requested_channel_id = channel_id or self.get_connected_channel_id()
@@ -672,6 +807,18 @@ class VoiceManager:
                 f"[provider={provider_name}, requested_channel_id={requested_channel_id}, "
                 f"current_channel_id={self._current_channel_id}, chars={len(text)}]"
             )
+            cache_key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            raw_data = self._synth_cache.get(cache_key)
+            if raw_data is not None:
+                self._synth_cache.move_to_end(cache_key)
+                self._logger.debug(
+                    "TTS synthesis cache hit "
+                    f"[provider={provider_name}, chars={len(text)}, bytes={len(raw_data)}]"
+                )
+            else:
+                # 合成与频道切换互不依赖，提前并行启动以重叠两段耗时。
+                synth_task = asyncio.create_task(self.tts_provider.synthesize(text))
+
             if channel_id:
                 current = self.get_connected_channel_id()
                 if current != channel_id:
@@ -684,6 +831,8 @@ class VoiceManager:
                             "TTS playback aborted because the target voice channel could not be connected "
                             f"[target_channel_id={channel_id}]"
                         )
+                        if synth_task is not None:
+                            synth_task.cancel()
                         return False
 
             if not self.voice_client or not self.voice_client.is_connected():
@@ -691,26 +840,32 @@ class VoiceManager:
                     "TTS playback aborted because no active voice connection is available "
                     f"[requested_channel_id={requested_channel_id}, current_channel_id={self._current_channel_id}]"
                 )
+                if synth_task is not None:
+                    synth_task.cancel()
                 return False
 
-            audio_stream = await self.tts_provider.synthesize(text)
-            if not audio_stream:
-                provider_last_error = self._get_tts_provider_last_error()
-                self._logger.error(
-                    "TTS synthesis returned no audio "
-                    f"[provider={provider_name}, requested_channel_id={requested_channel_id}, "
-                    f"provider_error={provider_last_error or '<empty>'}]"
-                )
-                return False
+            if synth_task is not None:
+                audio_stream = await synth_task
+                if not audio_stream:
+                    provider_last_error = self._get_tts_provider_last_error()
+                    self._logger.error(
+                        "TTS synthesis returned no audio "
+                        f"[provider={provider_name}, requested_channel_id={requested_channel_id}, "
+                        f"provider_error={provider_last_error or '<empty>'}]"
+                    )
+                    return False
 
-            audio_stream.seek(0)
-            raw_data = audio_stream.read()
-            if not raw_data:
-                self._logger.error(
-                    "TTS synthesis produced an empty audio stream "
-                    f"[provider={provider_name}, requested_channel_id={requested_channel_id}]"
-                )
-                return False
+                audio_stream.seek(0)
+                raw_data = audio_stream.read()
+                if not raw_data:
+                    self._logger.error(
+                        "TTS synthesis produced an empty audio stream "
+                        f"[provider={provider_name}, requested_channel_id={requested_channel_id}]"
+                    )
+                    return False
+                self._synth_cache[cache_key] = raw_data
+                if len(self._synth_cache) > TTS_SYNTH_CACHE_SIZE:
+                    self._synth_cache.popitem(last=False)
             fmt = _detect_audio_format(raw_data)
             self._logger.debug(
                 "TTS audio payload ready for playback "
@@ -737,7 +892,9 @@ class VoiceManager:
             else:
                 before_options = ""
 
-            audio_source = discord.FFmpegPCMAudio(
+            # FFmpegOpusAudio 让 FFmpeg 直接产出 Opus 包，discord.py 原样发送，
+            # 省去 PCM 源每 20ms 帧在 Python 层的 libopus 编码调用。
+            audio_source = discord.FFmpegOpusAudio(
                 io.BytesIO(raw_data),
                 pipe=True,
                 before_options=before_options,
@@ -769,13 +926,17 @@ class VoiceManager:
             return True
 
         except Exception as exc:
+            # 异常路径同样要回收提前启动的合成任务，否则它会悬空运行到
+            # GC 时报 "exception was never retrieved"。
+            if synth_task is not None and not synth_task.done():
+                synth_task.cancel()
             provider_last_error = self._get_tts_provider_last_error()
             self._logger.error(
                 "TTS playback failed "
                 f"[provider={type(self.tts_provider).__name__}, requested_channel_id={channel_id or self._current_channel_id}, "
                 f"provider_error={provider_last_error or '<empty>'}, error={exc}]"
             )
-            self._logger.debug(traceback.format_exc())
+            log_debug_traceback(self._logger)
             return False
 
 
@@ -809,6 +970,9 @@ class VoiceManager:
     async def _process_user_audio(self, member: discord.Member) -> None:
         """取该用户缓冲音频，转 PCM 后 STT，若有文本则调用回调。
 
+        可能有多个实例并发运行（多人同时关麦）；各用户缓冲互相独立，
+        STT 提供商需协程安全（现有实现均为共享会话 + 信号量，满足）。
+
         Args:
             member: 刚关麦的用户。
         """
@@ -819,7 +983,22 @@ class VoiceManager:
             if not audio_data:
                 return
 
-            pcm_data = convert_audio_to_pcm(audio_data, self._logger)
+            # 能量/时长门控：过短或过安静的片段不值一次 STT 调用。
+            samples = np.frombuffer(audio_data, dtype="<i2")
+            duration = samples.size / 96000.0  # 48kHz 立体声，每秒 96000 个采样
+            rms = (
+                float(np.sqrt(np.mean(samples.astype(np.float64) ** 2)))
+                if samples.size
+                else 0.0
+            )
+            if duration < _MIN_UTTERANCE_SECONDS or rms < _MIN_UTTERANCE_RMS:
+                self._logger.debug(
+                    "跳过低能量/过短语音片段: "
+                    f"user_id={member.id}, duration={duration:.2f}s, rms={rms:.0f}"
+                )
+                return
+
+            pcm_data = await convert_audio_to_pcm(audio_data, self._logger)
             text = await self.stt_provider.recognize(pcm_data)
 
             if text and self._stt_callback:
@@ -827,7 +1006,7 @@ class VoiceManager:
 
         except Exception as exc:
             self._logger.error(f"处理音频数据失败: {exc}")
-            self._logger.debug(traceback.format_exc())
+            log_debug_traceback(self._logger)
 
     def set_stt_callback(self, callback: Callable[..., Awaitable[None]]) -> None:
         """设置或替换 STT 结果异步回调。